@@ -6,7 +6,7 @@ a = Analysis(
     pathex=['.\\src'],
     binaries=[],
     datas=[('.\\data\\input\\model_contract.docx', 'assets')],
-    hiddenimports=['win32timezone', 'post_process', 'tkinter'],
+    hiddenimports=['win32timezone', 'post_process', 'supervisor', 'excel_renderer', 'job', 'tkinter'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,127 @@
+# =========================
+# file: benchmarks/bench_linearize.py
+# Tempo até a 1ª página: PDF final comum × linearizado (fast web view)
+#
+#   python benchmarks/bench_linearize.py [--pages 600] [--mbps 20]
+#
+# Gera um contrato grande (várias partes mescladas por post_process._merge_pdfs),
+# grava a saída comum e a linearizada e mede, para cada uma, quantos bytes o
+# visualizador precisa baixar até conseguir montar a página 1:
+#   - comum: a tabela xref fica no fim do arquivo → precisa do arquivo inteiro;
+#   - linearizado: basta o trecho da 1ª página (/E do dicionário de linearização).
+# Também mostra até onde vão os objetos da página 1 no arquivo (o mínimo possível
+# mesmo para um leitor que reconstrói a xref) e o tempo estimado na banda informada.
+# Obs.: o qpdf também comprime streams ao linearizar, então o tamanho total cai junto.
+# =========================
+from __future__ import annotations
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pikepdf  # noqa: E402
+import post_process  # noqa: E402
+
+
+def _make_part(path: Path, title: str, pages: int) -> Path:
+    from reportlab.pdfgen import canvas
+    cv = canvas.Canvas(str(path), pageCompression=0)
+    for p in range(pages):
+        cv.setFont("Helvetica-Bold", 12)
+        cv.drawString(40, 800, f"{title} — página {p + 1}")
+        cv.setFont("Helvetica", 7)
+        for line in range(95):
+            cv.drawString(40, 785 - line * 8, f"{line:03d} | ITEM {p}.{line} | DESCRIÇÃO DO SERVIÇO "
+                                              f"CONTRATADO CONFORME PROPOSTA | R$ {p * 100 + line:,.2f}")
+        cv.showPage()
+    cv.save()
+    return path
+
+
+def _object_spans(data: bytes) -> dict[int, tuple[int, int]]:
+    spans: dict[int, tuple[int, int]] = {}
+    for m in re.finditer(rb"(?<![0-9])(\d+) (\d+) obj\b", data):
+        end = data.find(b"endobj", m.end())
+        spans[int(m.group(1))] = (m.start(), end + len(b"endobj"))
+    return spans
+
+
+def _first_page_objects(pdf: pikepdf.Pdf) -> set[int]:
+    """Objetos indiretos alcançáveis a partir da página 1 (sem subir por /Parent)."""
+    seen: set[int] = set()
+    stack = [pdf.pages[0].obj]
+    while stack:
+        obj = stack.pop()
+        if not isinstance(obj, pikepdf.Object):
+            continue  # escalares já vêm como tipos Python
+        if obj.is_indirect:
+            num = obj.objgen[0]
+            if num in seen:
+                continue
+            seen.add(num)
+        if isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+            stack.extend(v for k, v in obj.items() if k != "/Parent")
+        elif isinstance(obj, pikepdf.Array):
+            stack.extend(obj)
+    return seen
+
+
+def measure(pdf_path: Path) -> dict[str, float]:
+    data = pdf_path.read_bytes()
+    spans = _object_spans(data)
+    t0 = time.perf_counter()
+    with pikepdf.open(pdf_path) as pdf:
+        linearized = pdf.is_linearized
+        page1_end = max(spans[n][1] for n in _first_page_objects(pdf) if n in spans)
+        pdf.pages[0].Contents.read_bytes()
+    parse_s = time.perf_counter() - t0
+
+    if linearized:
+        lin = re.search(rb"/Linearized.*?/E (\d+)", data[:2048], re.S)
+        needed = int(lin.group(1)) if lin else len(data)
+    else:
+        needed = len(data)  # por quê: sem linearização o viewer lê a xref do fim do arquivo
+    return {"size": len(data), "needed": needed, "page1_end": page1_end, "parse_s": parse_s}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Tempo até a 1ª página: PDF comum × linearizado")
+    ap.add_argument("--pages", type=int, default=600, help="total de páginas do contrato mesclado")
+    ap.add_argument("--mbps", type=float, default=20.0, help="banda da intranet/compartilhamento (Mbit/s)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        split = max(1, args.pages // 4)
+        parts = [
+            _make_part(tmp_dir / "01_contrato.pdf", "CONTRATO", split),
+            _make_part(tmp_dir / "02_quadro.pdf", "QUADRO DE CONCORRENCIA", split),
+            _make_part(tmp_dir / "03_cronograma.pdf", "CRONOGRAMA", split),
+            _make_part(tmp_dir / "04_checklist.pdf", "QUALIFICACAO", args.pages - 3 * split),
+        ]
+        plain, lin = tmp_dir / "plain.pdf", tmp_dir / "linearized.pdf"
+
+        t0 = time.perf_counter()
+        post_process._merge_pdfs(parts, plain)
+        t_plain = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        post_process._merge_pdfs(parts, lin, linearize=True)
+        t_lin = time.perf_counter() - t0
+
+        bps = args.mbps * 1_000_000 / 8
+        print(f"{args.pages} páginas, banda {args.mbps:g} Mbit/s")
+        print(f"{'saída':<12}{'tamanho':>12}{'bytes até p.1':>16}{'objs p.1 até':>15}"
+              f"{'1ª página (s)':>15}{'gerar (s)':>11}")
+        for name, path, build_s in (("comum", plain, t_plain), ("linearizada", lin, t_lin)):
+            m = measure(path)
+            ttfp = m["needed"] / bps + m["parse_s"]
+            print(f"{name:<12}{m['size']:>12,}{m['needed']:>16,}{m['page1_end']:>15,}"
+                  f"{ttfp:>15.3f}{build_s:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,7 @@ import sys
 import threading
 import logging
 from pathlib import Path
-from datetime import datetime
 from tkinter import Tk, ttk, filedialog, messagebox, StringVar, Text, DISABLED, NORMAL, END
-import importlib
 import os
 
 
@@ -49,10 +47,6 @@ class App:
         self._build_ui()
         self._wire_logging_to_ui()
 
-        # Import estático para o PyInstaller embutir; faremos reload depois
-        import post_process as _pp  # noqa: F401  (usado no reload)
-        self._post_process_modname = "post_process"
-
     # ---------- UI ----------
     def _build_ui(self) -> None:
         style = ttk.Style(self.root)
@@ -169,12 +163,6 @@ class App:
         self._setup_logging()
         logger = logging.getLogger("app")
         try:
-            # Override mínimo no config (antes do post_process)
-            import config
-            config.EXCEL_PATH = user_excel
-            config.OUTPUT_DIR = user_output_dir
-            config.BASE_DIR = user_output_dir  # sem arquivos fora da saída
-
             # Template dentro do bundle (adicionado via --add-data)
             template_path = resource_path(Path("assets") / "model_contract.docx")
             if not template_path.exists():
@@ -182,41 +170,29 @@ class App:
                     f"Template Word não encontrado no pacote: {template_path}"
                 )
 
-            # Coleta de dados do Excel
             from excel_reader import ExcelReader
             from word_writer import WordWriter
+            from post_process import build_final_pdf
+            from job import JobContext
 
-            replacements: dict[str, str] = {}
-            with ExcelReader(user_excel) as reader:
-                for marker, (sheet, cell) in config.MAPPING.items():
-                    value = reader.get_cell_value(sheet, cell)
-                    replacements[marker] = "" if value is None else str(value)
-                    logger.info("Coletado: %s → %s", marker, replacements[marker])
-
-            timestamp = datetime.now().strftime("%d-%m-%y_%H-%M")
-            filled_docx = user_output_dir / f"ContratoPreenchido_{timestamp}.docx"
-
-            writer = WordWriter(template_path)
-            if not writer.replace_in_document(replacements, filled_docx):
-                raise RuntimeError("Falha na geração do DOCX.")
+            # Paths do usuário vão no job (sem mexer no config); workspace é removido ao sair
+            with JobContext(excel_path=user_excel, output_dir=user_output_dir, template_path=template_path) as job:
+                # Coleta de dados do Excel
+                with ExcelReader.from_job(job) as reader:
+                    values = reader.read_mapping(job.mapping)
+                replacements = {k: "" if v is None else str(v) for k, v in values.items()}
 
-            logger.info("DOCX gerado com sucesso. Iniciando pós-processamento (PDF final).")
+                # DOCX intermediário fica no workspace do job (somente PDF final é publicado)
+                writer = WordWriter.from_job(job)
+                if not writer.replace_in_document(replacements, job.filled_docx):
+                    raise RuntimeError("Falha na geração do DOCX.")
 
-            # Recarrega módulo já empacotado para pegar paths do config atual
-            post_process = importlib.reload(importlib.import_module(self._post_process_modname))
-            final_pdf = post_process.build_final_pdf(filled_docx)
+                logger.info("DOCX gerado com sucesso. Iniciando pós-processamento (PDF final).")
+                final_pdf = build_final_pdf(job.filled_docx, job=job)
 
             if not final_pdf:
                 raise RuntimeError("Pós-processamento falhou. Veja as etapas acima.")
 
-            # Remove o DOCX intermediário (somente PDF final fica)
-            try:
-                if filled_docx.exists():
-                    filled_docx.unlink()
-                    logger.info("DOCX intermediário removido.")
-            except Exception:
-                pass
-
             logger.info("Processo concluído! PDF final: %s", final_pdf)
             self._notify_ok(final_pdf)
 
@@ -245,6 +221,8 @@ class App:
 
 
 def main() -> None:
+    import multiprocessing
+    multiprocessing.freeze_support()  # por quê: workers do supervisor no executável PyInstaller
     root = Tk()
     App(root)
     root.mainloop()
@@ -108,3 +108,23 @@ OUTPUT_DIR = DATA_DIR / "output"
 
 EXCEL_PATH = INPUT_DIR / "template_spreadsheet.xlsx"
 TEMPLATE_PATH = INPUT_DIR / "model_contract.docx"
+
+# PDF final linearizado (fast web view): página 1 abre antes do download completo.
+# Requer pikepdf (qpdf).
+LINEARIZE_PDF = False
+
+# Supervisor das conversões Office (segundos por etapa; "default" para as demais)
+CONVERSION_TIMEOUTS = {"docx": 180.0, "excel": 120.0, "native": 120.0, "default": 300.0}
+CONVERSION_RETRIES = 2         # tentativas extras por etapa
+CONVERSION_BACKOFF = 5.0       # espera antes da 1ª nova tentativa (dobra a cada uma)
+QUARANTINE_AFTER = 2           # execuções falhas seguidas até a entrada ir para quarentena
+QUARANTINE_DIR = OUTPUT_DIR / "_quarentena"
+
+# Áreas do Excel anexadas ao PDF final: (aba, intervalo, arquivo, paisagem, renderizador)
+# "excel": exporta via Excel COM (Windows + MS Excel instalado)
+# "native": desenha direto dos dados do openpyxl (excel_renderer); dispensa Excel e roda em paralelo
+EXCEL_RANGES = [
+    ("QUADRO DE CONCORRENCIA", "A1:K133", "02_quadro.pdf", False, "excel"),
+    ("CRONOGRAMA", "B2:T26", "03_cronograma.pdf", True, "excel"),
+    ("QUALIFICACAO", "B2:E36", "04_checklist.pdf", False, "excel"),
+]
@@ -2,9 +2,12 @@
 from openpyxl import load_workbook
 import logging
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from datetime import datetime, date
 
+if TYPE_CHECKING:
+    from job import JobContext
+
 
 class ExcelReader:
     def __init__(self, file_path: Path):
@@ -12,6 +15,11 @@ class ExcelReader:
         self.wb = None
         self.logger = logging.getLogger(__name__)
 
+    @classmethod
+    def from_job(cls, job: "JobContext") -> "ExcelReader":
+        """Leitor da planilha do job (por quê: path explícito, sem globals do config)."""
+        return cls(job.excel_path)
+
     def __enter__(self):
         try:
             # por quê: garantir valores resolvidos das fórmulas
@@ -64,6 +72,14 @@ class ExcelReader:
             return self._format_brl(value)
         return value
 
+    def read_mapping(self, mapping: dict[str, tuple[str, str]]) -> dict[str, Any]:
+        """Lê todas as células de ``mapping`` ({marcador: (aba, célula)})."""
+        values: dict[str, Any] = {}
+        for marker, (sheet, cell) in mapping.items():
+            values[marker] = self.get_cell_value(sheet, cell)
+            self.logger.info(f"Coletado: {marker} → {values[marker]}")
+        return values
+
     def get_cell_value(self, sheet_name: str, cell_address: str):
         try:
             sheet = self.wb[sheet_name]  # type: ignore[index]
@@ -0,0 +1,770 @@
+# =========================
+# file: src/excel_renderer.py
+# Renderizador nativo Excel→PDF: desenha um intervalo da planilha direto em páginas PDF
+# a partir dos dados do openpyxl (sem Excel/COM; roda em Linux e em processos paralelos)
+# =========================
+from __future__ import annotations
+import colorsys
+import logging
+import math
+import operator
+import re
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Context, Decimal, InvalidOperation
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger("excel_renderer")
+
+# Conversões de unidade (Excel → pontos PDF)
+_DEFAULT_COL_WIDTH = 8.43   # caracteres
+_DEFAULT_ROW_HEIGHT = 15.0  # pontos
+_PAD = 2.0                  # respiro interno da célula, em pontos
+
+_BORDER_WIDTHS = {
+    "hair": 0.25, "thin": 0.5, "dotted": 0.5, "dashed": 0.5, "dashDot": 0.5, "dashDotDot": 0.5,
+    "medium": 1.0, "mediumDashed": 1.0, "mediumDashDot": 1.0, "mediumDashDotDot": 1.0,
+    "slantDashDot": 1.0, "thick": 1.5, "double": 1.5,
+}
+_BORDER_DASHES = {
+    "dotted": (1, 1), "dashed": (3, 2), "mediumDashed": (3, 2), "dashDot": (3, 1, 1, 1),
+    "mediumDashDot": (3, 1, 1, 1), "dashDotDot": (3, 1, 1, 1, 1, 1),
+    "mediumDashDotDot": (3, 1, 1, 1, 1, 1), "slantDashDot": (3, 1, 1, 1),
+}
+
+_MONTHS = ["janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho",
+           "agosto", "setembro", "outubro", "novembro", "dezembro"]
+_WEEKDAYS = ["segunda-feira", "terça-feira", "quarta-feira", "quinta-feira",
+             "sexta-feira", "sábado", "domingo"]
+
+
+# ---------- Formatos numéricos ----------
+def _col_width_pt(width: float) -> float:
+    # por quê: a largura gravada no arquivo (ECMA-376 ``width``) já inclui os 5 px de margem:
+    # px ≈ width × 7 (largura do dígito "0" da fonte padrão)
+    return 0.0 if width <= 0 else width * 7.0 * 0.75
+
+
+def _ui_col_width_pt(chars: float) -> float:
+    # Largura em caracteres como o Excel exibe (8,43 padrão): soma os 5 px de margem
+    return 0.0 if chars <= 0 else (chars * 7.0 + 5.0) * 0.75
+
+
+def _general(value: Any) -> str:
+    if isinstance(value, bool):
+        return "VERDADEIRO" if value else "FALSO"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.10g}".replace(".", ",")
+    return str(value)
+
+
+def _format_date(value: date | datetime | time, fmt: str) -> str:
+    """Converte tokens de data/hora do Excel (d, m, a/y, h, s) em texto pt-BR."""
+    if isinstance(value, time):
+        value = datetime.combine(date(1900, 1, 1), value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    tokens = re.findall(r'"[^"]*"|\\.|yyyy|yy|aaaa|aa|mmmm|mmm|mm|m|dddd|ddd|dd|d|hh|h|ss|s|AM/PM|.', fmt, re.I)
+    out: list[str] = []
+    for i, tok in enumerate(tokens):
+        low = tok.lower()
+        prev = next((t.lower() for t in reversed(tokens[:i]) if t.strip(":/. -")), "")
+        nxt = next((t.lower() for t in tokens[i + 1:] if t.strip(":/. -")), "")
+        if low in ("mm", "m") and (prev.startswith("h") or nxt.startswith("s")):
+            out.append(f"{value.minute:02d}" if low == "mm" else str(value.minute))
+        elif low in ("yyyy", "aaaa"):
+            out.append(f"{value.year:04d}")
+        elif low in ("yy", "aa"):
+            out.append(f"{value.year % 100:02d}")
+        elif low == "mmmm":
+            out.append(_MONTHS[value.month - 1])
+        elif low == "mmm":
+            out.append(_MONTHS[value.month - 1][:3])
+        elif low == "mm":
+            out.append(f"{value.month:02d}")
+        elif low == "m":
+            out.append(str(value.month))
+        elif low == "dddd":
+            out.append(_WEEKDAYS[value.weekday()])
+        elif low == "ddd":
+            out.append(_WEEKDAYS[value.weekday()][:3])
+        elif low == "dd":
+            out.append(f"{value.day:02d}")
+        elif low == "d":
+            out.append(str(value.day))
+        elif low == "hh":
+            out.append(f"{value.hour:02d}")
+        elif low == "h":
+            out.append(str(value.hour))
+        elif low == "ss":
+            out.append(f"{value.second:02d}")
+        elif low == "s":
+            out.append(str(value.second))
+        elif tok.startswith('"'):
+            out.append(tok[1:-1])
+        elif tok.startswith("\\"):
+            out.append(tok[1:])
+        else:
+            out.append(tok)
+    return "".join(out)
+
+
+# Placeholders: científico (0.00E+00), fração (# ?/?, ?/8) e número comum, nesta ordem
+_NUM_TOKEN = re.compile(
+    r'"[^"]*"|\\.|_.|\*.|\[[^\]]*\]'
+    r'|[0#?][0#?,.]*[eE][+-][0#?]+'
+    r'|(?:[0#?]+ +)?[0#?]+/(?:[0#?]+|\d+)'
+    r'|[0#?][0#?,.]*|\.[0#?][0#?,]*|.',
+    re.S,
+)
+_COND = re.compile(r"\[(<=|>=|<>|<|>|=)\s*(-?\d+(?:[.,]\d+)?)\]")
+_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+        "=": operator.eq, "<>": operator.ne}
+# por quê: o contexto padrão (28 dígitos) levanta InvalidOperation em valores como 1e30
+_DEC_CTX = Context(prec=400)
+
+
+def _round_half_up(num: float, decimals: int) -> str:
+    """``num`` com ``decimals`` casas, metade para cima (como o Excel); nunca levanta."""
+    try:
+        q = Decimal(repr(num)).quantize(Decimal(1).scaleb(-decimals), rounding=ROUND_HALF_UP, context=_DEC_CTX)
+        return f"{q:f}"
+    except (InvalidOperation, ValueError, OverflowError):
+        return f"{num:.{decimals}f}"
+
+
+def _render_number(num: float, pattern: str) -> str:
+    """Número (já sem sinal) segundo os placeholders 0/#/?, com separadores pt-BR."""
+    int_pat, _, dec_pat = pattern.partition(".")
+    # Vírgulas no fim da parte inteira dividem por mil (ex.: "#,##0,")
+    scale_by = len(int_pat) - len(int_pat.rstrip(","))
+    int_pat = int_pat.rstrip(",")
+    num = num / (1000 ** scale_by)
+    dec_pat = dec_pat.replace(",", "")
+    int_digits, _, dec_digits = _round_half_up(num, len(dec_pat)).partition(".")
+
+    if int(int_digits) == 0 and "0" not in int_pat:
+        int_text = " " * int_pat.count("?")  # "#" some; "?" vira espaço
+    else:
+        int_text = int_digits.zfill(int_pat.count("0"))
+        if "," in int_pat:
+            int_text = f"{int(int_text):,}".replace(",", ".").rjust(len(int_text), "0")
+
+    if not dec_pat:
+        return int_text
+    dec = list(dec_digits)
+    for i in range(len(dec) - 1, -1, -1):
+        if dec[i] != "0" or dec_pat[i] == "0":
+            break
+        dec[i] = " " if dec_pat[i] == "?" else ""
+    return f"{int_text},{''.join(dec)}"
+
+
+def _render_scientific(num: float, pattern: str) -> str:
+    """Notação científica: "0.00E+00" → 1,23E+04; com N dígitos inteiros o expoente é múltiplo de N."""
+    mant_pat, exp_sign, exp_pat = re.match(r"(.*?)[eE]([+-])(.*)", pattern).groups()
+    step = max(1, sum(mant_pat.partition(".")[0].count(ch) for ch in "0#?"))
+    exp = 0
+    if num:
+        exp = math.floor(math.log10(num) / step) * step
+        # por quê: o arredondamento da mantissa pode chegar a 10^step (9,999 → 10,00)
+        decimals = len(mant_pat.partition(".")[2])
+        if float(_round_half_up(num / 10.0 ** exp, decimals)) >= 10.0 ** step:
+            exp += step
+    mant = _render_number(num / 10.0 ** exp if num else 0.0, mant_pat)
+    sign = "-" if exp < 0 else ("+" if exp_sign == "+" else "")
+    return f"{mant}E{sign}{str(abs(exp)).zfill(exp_pat.count('0'))}"
+
+
+def _render_fraction(num: float, pattern: str) -> str:
+    """Fração: "# ?/?" → 2 1/2; denominador fixo ("?/8") ou até N dígitos ("??/??")."""
+    whole_pat, _, frac_pat = pattern.rpartition(" ") if " " in pattern else ("", "", pattern)
+    num_pat, den_pat = frac_pat.split("/")
+    whole, frac = (int(num), num - int(num)) if whole_pat else (0, num)
+    if den_pat.isdigit():
+        den = int(den_pat)
+        numer = int(_round_half_up(frac * den, 0))
+    else:
+        f = Fraction(frac).limit_denominator(10 ** len(den_pat) - 1)
+        numer, den = f.numerator, f.denominator
+    if whole_pat and numer == den:
+        whole, numer = whole + 1, 0
+    if numer == 0:
+        return str(whole) if whole or not whole_pat or not num else "0"
+    frac_text = f"{numer}/{den}"
+    if whole_pat and (whole or "0" in whole_pat):
+        return f"{whole} {frac_text}"
+    return frac_text
+
+
+def _format_elapsed(value: timedelta, fmt: str) -> str:
+    """Duração (openpyxl devolve ``timedelta`` para "[h]:mm") com horas/minutos acumulados."""
+    total = round(value.total_seconds())
+    sign, total = ("-" if total < 0 else ""), abs(total)
+    tokens = re.findall(r'"[^"]*"|\\.|\[h+\]|\[m+\]|\[s+\]|h+|m+|s+|\[[^\]]*\]|.', fmt, re.I)
+    lows = [t.lower() for t in tokens]
+    if not any(t.strip("[]")[:1] in ("h", "m", "s") for t in lows):
+        return sign + _general(total / 86400.0)  # por quê: sem h/m/s o Excel mostra dias
+    if any(t.startswith("[h") for t in lows):
+        hours, minutes, seconds = total // 3600, total // 60 % 60, total % 60
+    elif any(t.startswith("[m") for t in lows):
+        hours, minutes, seconds = 0, total // 60, total % 60
+    elif any(t.startswith("[s") for t in lows):
+        hours, minutes, seconds = 0, 0, total
+    else:
+        hours, minutes, seconds = total // 3600 % 24, total // 60 % 60, total % 60
+    out: list[str] = []
+    for tok, low in zip(tokens, lows):
+        unit = low.strip("[]")[:1]
+        if unit in ("h", "m", "s") and low.strip("[]").strip(unit) == "":
+            amount = {"h": hours, "m": minutes, "s": seconds}[unit]
+            out.append(str(amount).zfill(min(len(low.strip("[]")), 2)))
+        elif tok.startswith('"'):
+            out.append(tok[1:-1])
+        elif tok.startswith("\\"):
+            out.append(tok[1:])
+        elif not tok.startswith("["):
+            out.append(tok)
+    return sign + "".join(out)
+
+
+def _choose_section(value: float, sections: list[str]) -> tuple[str, bool]:
+    """Seção do formato para ``value`` e se o sinal "-" deve ser escrito.
+
+    Sem condições: positivo;negativo;zero (a seção negativa traz o sinal como literal).
+    Com condições ("[>=100]...;..."): 1ª seção se a condição vale, senão a 2ª (se tiver
+    condição e ela valer), senão a seguinte, como o Excel.
+    """
+    c1 = _COND.search(sections[0])
+    c2 = _COND.search(sections[1]) if len(sections) > 1 else None
+    if c1 or c2:
+        def holds(m: Optional[re.Match]) -> bool:
+            return bool(m) and _OPS[m.group(1)](value, float(m.group(2).replace(",", ".")))
+        if holds(c1):
+            idx = 0
+        elif holds(c2):
+            idx = 1
+        else:
+            idx = min(2 if c1 and c2 else 1, len(sections) - 1)
+        cond = _COND.search(sections[idx])
+        # Seção cuja condição só admite negativos (ex.: "[<0]") faz o papel da seção negativa
+        only_negative = bool(cond) and cond.group(1) in ("<", "<=") and float(cond.group(2).replace(",", ".")) <= 0
+        return sections[idx], value < 0 and not only_negative
+    if value < 0 and len(sections) > 1:
+        return sections[1], False
+    if value == 0 and len(sections) > 2:
+        return sections[2], False
+    return sections[0], value < 0
+
+
+def _format_text(text: str, section: str) -> str:
+    """Seção de texto ("@" = o próprio texto, com literais e espaçamentos)."""
+    out: list[str] = []
+    for tok in re.findall(r'"[^"]*"|\\.|_.|\*.|\[[^\]]*\]|.', section, re.S):
+        if tok.startswith('"'):
+            out.append(tok[1:-1])
+        elif tok.startswith("\\"):
+            out.append(tok[1:])
+        elif tok[0] in "_*":
+            out.append(" ")
+        elif tok == "@":
+            out.append(text)
+        elif not tok.startswith("["):
+            out.append(tok)
+    return re.sub(r" {2,}", " ", "".join(out)).strip()
+
+
+def _format_number(value: float, fmt: str) -> str:
+    section, signed = _choose_section(value, fmt.split(";"))
+    if not section:
+        return ""  # seção vazia esconde o valor (ex.: "0;;" para negativos e zero)
+    if section.lower() == "general":
+        return ("-" if signed else "") + _general(abs(value))
+
+    percent = "%" in re.sub(r'"[^"]*"|\\.', "", section)
+    number = abs(float(value)) * (100.0 if percent else 1.0)
+    out: list[str] = []
+    placed = False
+    for tok in _NUM_TOKEN.findall(section):
+        if tok.startswith('"'):
+            out.append(tok[1:-1])
+        elif tok.startswith("\\"):
+            out.append(tok[1:])
+        elif tok[0] in "_*":
+            out.append(" ")  # espaço de alinhamento / preenchimento até a largura
+        elif tok.startswith("["):
+            m = re.match(r"\[\$([^\]-]*)", tok)  # [$R$-416] → "R$"; [Red], [>=0] somem
+            if m:
+                out.append(m.group(1))
+        elif tok[0] in "0#?" or (tok[0] == "." and len(tok) > 1):
+            if not placed:
+                if "/" in tok:
+                    out.append(_render_fraction(number, tok))
+                elif re.search(r"[eE][+-]", tok):
+                    out.append(_render_scientific(number, tok))
+                else:
+                    out.append(_render_number(number, tok))
+                placed = True
+        else:
+            out.append(tok)
+    if not placed and value != 0 and not any(t for t in out if t.strip()):
+        out.append(_general(abs(value)))
+    # por quê: "_x" e "* " só alinham no Excel; aqui colapsam para um espaço simples
+    return ("-" if signed else "") + re.sub(r" {2,}", " ", "".join(out)).strip()
+
+
+def format_value(value: Any, number_format: Optional[str]) -> str:
+    """Texto exibido pela célula segundo o number_format do Excel (convenções pt-BR).
+    Nunca levanta: formato que não se consegue interpretar cai no "Geral".
+    """
+    if value is None:
+        return ""
+    fmt = (number_format or "General").strip()
+    try:
+        if isinstance(value, timedelta):
+            return _format_elapsed(value, fmt)
+        if isinstance(value, (datetime, date, time)):
+            # por quê: o formato interno 14 ("mm-dd-yy") segue a data curta do sistema (pt-BR)
+            if fmt.lower() in ("general", "mm-dd-yy"):
+                fmt = "dd/mm/yyyy" if not isinstance(value, time) else "hh:mm"
+            return _format_date(value, re.sub(r"\[[^\]]*\]", "", fmt.split(";")[0]))
+        if isinstance(value, bool):
+            return _general(value)
+        if not isinstance(value, (int, float)):
+            sections = fmt.split(";")
+            if len(sections) >= 4:
+                return _format_text(str(value), sections[3])
+            if len(sections) == 1 and "@" in fmt:
+                return _format_text(str(value), fmt)
+            return str(value)
+        if fmt.lower() == "general" or fmt == "@" or not math.isfinite(value):
+            return _general(value)
+        return _format_number(value, fmt)
+    except Exception as e:
+        logger.debug(f"Formato não suportado {fmt!r} ({e}); usando Geral")
+        return _general(value)
+
+
+# ---------- Estilos ----------
+# Ordem dos índices de tema do Excel: 0/1 e 2/3 trocados em relação ao clrScheme
+_THEME_SLOTS = ["lt1", "dk1", "lt2", "dk2", "accent1", "accent2", "accent3",
+                "accent4", "accent5", "accent6", "hlink", "folHlink"]
+
+
+def _theme_colors(wb: Any) -> list[Optional[str]]:
+    """Paleta do tema da pasta (hex RRGGBB por índice de tema)."""
+    import xml.etree.ElementTree as ET
+    palette: list[Optional[str]] = [None] * len(_THEME_SLOTS)
+    raw = getattr(wb, "loaded_theme", None)
+    if not raw:
+        return palette
+    try:
+        root = ET.fromstring(raw)
+    except ET.ParseError:
+        return palette
+    ns = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+    scheme = root.find(f".//{ns}clrScheme")
+    if scheme is None:
+        return palette
+    for i, slot in enumerate(_THEME_SLOTS):
+        node = scheme.find(f"{ns}{slot}")
+        if node is None or not len(node):
+            continue
+        clr = node[0]
+        palette[i] = clr.get("val") if clr.tag == f"{ns}srgbClr" else clr.get("lastClr")
+    return palette
+
+
+def _apply_tint(rgb: tuple[float, float, float], tint: float) -> tuple[float, float, float]:
+    """Tint do Excel: escurece (tint < 0) ou clareia (tint > 0) a luminância HLS."""
+    if not tint:
+        return rgb
+    h, lum, sat = colorsys.rgb_to_hls(*rgb)
+    lum = lum * (1.0 + tint) if tint < 0 else lum * (1.0 - tint) + tint
+    return colorsys.hls_to_rgb(h, min(max(lum, 0.0), 1.0), sat)
+
+
+def _rgb(color: Any, theme: Optional[list[Optional[str]]] = None) -> Optional[tuple[float, float, float]]:
+    """Cor openpyxl (rgb, indexed ou tema + tint) → tupla 0–1; ``None`` = automática."""
+    if color is None:
+        return None
+    try:
+        if color.type == "rgb" and isinstance(color.rgb, str):
+            hexa = color.rgb[-6:]
+        elif color.type == "indexed":
+            from openpyxl.styles.colors import COLOR_INDEX
+            idx = int(color.indexed)
+            if idx >= len(COLOR_INDEX) or idx in (64, 65):  # system foreground/background
+                return None
+            hexa = COLOR_INDEX[idx][-6:]
+        elif color.type == "theme" and theme:
+            idx = int(color.theme)
+            if idx >= len(theme) or not theme[idx]:
+                return None
+            hexa = theme[idx]  # type: ignore[assignment]
+        else:
+            return None
+        rgb = tuple(int(hexa[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+        return _apply_tint(rgb, float(color.tint or 0.0))  # type: ignore[arg-type]
+    except Exception:
+        return None
+
+
+def _font_name(bold: bool, italic: bool) -> str:
+    if bold and italic:
+        return "Helvetica-BoldOblique"
+    if bold:
+        return "Helvetica-Bold"
+    if italic:
+        return "Helvetica-Oblique"
+    return "Helvetica"
+
+
+# ---------- Renderização ----------
+# Tamanhos de papel do Excel (PageSetup.paperSize) em pontos; demais caem em A4
+_PAPER_SIZES = {1: (612.0, 792.0), 5: (612.0, 1008.0), 8: (841.89, 1190.55),
+                9: (595.28, 841.89), 11: (419.53, 595.28)}
+
+
+def _fit_scale(ws: Any, total_w: float, total_h: float, avail_w: float, avail_h: float) -> float:
+    """Escala de impressão conforme a configuração da planilha.
+
+    "Ajustar a N páginas de largura × M de altura" (0 = automático) e, sem ajuste,
+    o zoom (``scale``, inclusive 100%). Sem nenhuma das duas: 1 página de largura.
+    """
+    props = ws.sheet_properties.pageSetUpPr
+    ps = ws.page_setup
+    if props is not None and props.fitToPage:
+        wide = 1 if ps.fitToWidth is None else int(ps.fitToWidth)
+        tall = 1 if ps.fitToHeight is None else int(ps.fitToHeight)
+        scale = 1.0  # por quê: ajustar só reduz, nunca amplia
+        if wide:
+            scale = min(scale, wide * avail_w / total_w)
+        if tall:
+            scale = min(scale, tall * avail_h / total_h)
+    elif ps.scale:
+        scale = int(ps.scale) / 100.0
+    else:
+        scale = min(1.0, avail_w / total_w)
+    return min(max(scale, 0.1), 4.0)  # limites do Excel: 10%–400%
+
+
+def _paginate(
+    keys: list[int],
+    sizes: dict[int, float],
+    avail: float,
+    titles: Optional[tuple[int, float]] = None,
+) -> list[list[int]]:
+    """Quebra linhas (ou colunas) em páginas sem ultrapassar ``avail`` (já em escala).
+    ``titles`` = (última linha/coluna de título, tamanho): página que começa depois dela
+    reserva espaço para os títulos repetidos.
+    """
+    def capacity(first: int) -> float:
+        return avail - titles[1] if titles and first > titles[0] else avail
+
+    pages: list[list[int]] = [[]]
+    used, cap = 0.0, capacity(keys[0]) if keys else avail
+    for k in keys:
+        if pages[-1] and used + sizes[k] > cap + 0.01:
+            pages.append([])
+            used, cap = 0.0, capacity(k)
+        pages[-1].append(k)
+        used += sizes[k]
+    return pages
+
+
+def _title_span(ref: Optional[str], cols: bool) -> Optional[tuple[int, int]]:
+    """"$2:$25" → (2, 25); "$A:$B" → (1, 2). Linhas/colunas repetidas em cada página."""
+    from openpyxl.utils.cell import column_index_from_string
+    m = re.match(r"\$?([A-Z]+|\d+):\$?([A-Z]+|\d+)$", (ref or "").split(",")[0].strip(), re.I)
+    if not m:
+        return None
+    a, b = m.groups()
+    if cols:
+        if a.isdigit():
+            return None
+        return column_index_from_string(a.upper()), column_index_from_string(b.upper())
+    return (int(a), int(b)) if a.isdigit() else None
+
+
+def _side(primary: Any, fallback: Any) -> Any:
+    return primary if getattr(primary, "style", None) else fallback
+
+
+def render_range_to_pdf(xlsx: Path, sheet: str, rng: str, out_pdf: Path, *, landscape: Optional[bool] = None) -> None:
+    """Desenha ``sheet!rng`` em ``out_pdf`` seguindo papel, margens e ajuste de página da planilha.
+    Mesma assinatura de ``post_process._export_excel_range_to_pdf`` para ser intercambiável.
+    """
+    from openpyxl import load_workbook
+    from openpyxl.utils.cell import range_boundaries
+    from reportlab.pdfgen import canvas
+
+    out_pdf.parent.mkdir(parents=True, exist_ok=True)
+    # por quê: valores resolvidos das fórmulas (mesmo critério do ExcelReader)
+    wb = load_workbook(Path(xlsx), data_only=True)
+    try:
+        ws = wb[sheet]
+        theme = _theme_colors(wb)
+        min_col, min_row, max_col, max_row = range_boundaries(rng)
+        cols = list(range(min_col, max_col + 1))
+        all_rows = list(range(min_row, max_row + 1))
+        # Títulos de impressão ("Linhas/colunas a repetir"), como no export COM
+        t_rows = _title_span(ws.print_title_rows, cols=False)
+        t_cols = _title_span(ws.print_title_cols, cols=True)
+        title_rows = list(range(t_rows[0], t_rows[1] + 1)) if t_rows else []
+        title_cols = list(range(t_cols[0], t_cols[1] + 1)) if t_cols else []
+        # Geometria e mesclas cobrem o intervalo e os títulos (que podem estar fora dele)
+        lo_col, hi_col = min([min_col, *title_cols]), max([max_col, *title_cols])
+        lo_row, hi_row = min([min_row, *title_rows]), max([max_row, *title_rows])
+
+        # Geometria: larguras/alturas em pontos, ocultas viram zero
+        stored_default = ws.sheet_format.defaultColWidth
+        default_w = _col_width_pt(stored_default) if stored_default else _ui_col_width_pt(_DEFAULT_COL_WIDTH)
+        default_h = ws.sheet_format.defaultRowHeight or _DEFAULT_ROW_HEIGHT
+        col_w = {c: default_w for c in range(lo_col, hi_col + 1)}
+        for dim in ws.column_dimensions.values():
+            # por quê: uma dimensão pode cobrir várias colunas (min..max)
+            lo, hi = dim.min or 0, dim.max or 0
+            for c in range(max(lo, lo_col), min(hi, hi_col) + 1):
+                if dim.hidden:
+                    col_w[c] = 0.0
+                elif dim.customWidth and dim.width:
+                    col_w[c] = _col_width_pt(dim.width)
+        row_h: dict[int, float] = {}
+        for r in range(lo_row, hi_row + 1):
+            dim = ws.row_dimensions.get(r)
+            hidden = bool(dim and dim.hidden)
+            row_h[r] = 0.0 if hidden else float(dim.height if dim and dim.height else default_h)
+
+        # Mesclas: âncora → (col_fim, lin_fim); demais células apontam para a âncora
+        anchors: dict[tuple[int, int], tuple[int, int]] = {}
+        owner: dict[tuple[int, int], tuple[int, int]] = {}
+        for mr in ws.merged_cells.ranges:
+            if mr.max_col < lo_col or mr.min_col > hi_col or mr.max_row < lo_row or mr.min_row > hi_row:
+                continue
+            anchor = (max(mr.min_row, lo_row), max(mr.min_col, lo_col))
+            anchors[anchor] = (min(mr.max_col, hi_col), min(mr.max_row, hi_row))
+            for r in range(anchor[0], min(mr.max_row, hi_row) + 1):
+                for c in range(anchor[1], min(mr.max_col, hi_col) + 1):
+                    if (r, c) != anchor:
+                        owner[(r, c)] = anchor
+
+        # Página: orientação explícita > configuração da planilha; papel e margens da planilha
+        if landscape is None:
+            landscape = (ws.page_setup.orientation or "").lower() == "landscape"
+        paper_w, paper_h = _PAPER_SIZES.get(int(ws.page_setup.paperSize or 9), _PAPER_SIZES[9])
+        page_w, page_h = (max(paper_w, paper_h), min(paper_w, paper_h)) if landscape else (paper_w, paper_h)
+        pm = ws.page_margins
+        left, right = (pm.left or 0.7) * 72, (pm.right or 0.7) * 72
+        top, bottom = (pm.top or 0.75) * 72, (pm.bottom or 0.75) * 72
+        avail_w, avail_h = page_w - left - right, page_h - top - bottom
+
+        total_w = sum(col_w[c] for c in cols) or 1.0
+        total_h = sum(row_h[r] for r in all_rows) or 1.0
+        scale = _fit_scale(ws, total_w, total_h, avail_w, avail_h)
+        # Páginas: faixas de colunas × blocos de linhas, "abaixo e depois acima" como o Excel.
+        # Títulos só se repetem nas páginas que começam depois deles (na 1ª já aparecem)
+        titles_w = sum(col_w[c] for c in title_cols) * scale
+        titles_h = sum(row_h[r] for r in title_rows) * scale
+        col_bands = _paginate(cols, {c: col_w[c] * scale for c in cols}, avail_w,
+                              (title_cols[-1], titles_w) if title_cols else None)
+        row_pages = _paginate(all_rows, {r: row_h[r] * scale for r in all_rows}, avail_h,
+                              (title_rows[-1], titles_h) if title_rows else None)
+        h_center = bool(ws.print_options.horizontalCentered)
+        v_center = bool(ws.print_options.verticalCentered)
+
+        cv = canvas.Canvas(str(out_pdf), pagesize=(page_w, page_h))
+        cv.setTitle(f"{sheet}!{rng}")
+        for band in col_bands:
+            band_cols = [title_cols, band] if title_cols and band[0] > title_cols[-1] else [band]
+            for rows in row_pages:
+                page_rows = [title_rows, rows] if title_rows and rows[0] > title_rows[-1] else [rows]
+                used_w = sum(col_w[c] for part in band_cols for c in part) * scale
+                used_h = sum(row_h[r] for part in page_rows for r in part) * scale
+                x0 = left + (max(avail_w - used_w, 0.0) / 2 if h_center else 0.0)
+                y = page_h - top - (max(avail_h - used_h, 0.0) / 2 if v_center else 0.0)
+                # Cada bloco (títulos / corpo) é desenhado à parte para as mesclas cortarem na divisa
+                for part_rows in page_rows:
+                    x = x0
+                    for part_cols in band_cols:
+                        _draw_page(cv, ws, theme, part_cols, part_rows, col_w, row_h, anchors, owner,
+                                   (x, y, scale))
+                        x += sum(col_w[c] for c in part_cols) * scale
+                    y -= sum(row_h[r] for r in part_rows) * scale
+                cv.showPage()
+        cv.save()
+        n_pages = len(col_bands) * len(row_pages)
+        logger.info(f"Excel→PDF nativo {sheet}!{rng}: {out_pdf} ({n_pages} pág., escala {scale:.0%})")
+    except Exception as e:
+        logger.error(f"Falha Excel→PDF nativo ({sheet}!{rng}): {e}")
+        raise
+    finally:
+        wb.close()
+
+
+def _draw_page(
+    cv: Any,
+    ws: Any,
+    theme: list[Optional[str]],
+    band: list[int],
+    rows: list[int],
+    col_w: dict[int, float],
+    row_h: dict[int, float],
+    anchors: dict[tuple[int, int], tuple[int, int]],
+    owner: dict[tuple[int, int], tuple[int, int]],
+    origin: tuple[float, float, float],
+) -> None:
+    """Um bloco da página: colunas ``band`` × linhas ``rows``, na escala de ``origin``
+    (canto superior esquerdo do bloco). Títulos repetidos são blocos à parte.
+    """
+    from reportlab.lib.utils import simpleSplit
+
+    first_col, last_col = band[0], band[-1]
+    first_row, last_row = rows[0], rows[-1]
+    col_x: dict[int, float] = {}
+    x = 0.0
+    for c in band:
+        col_x[c] = x
+        x += col_w[c]
+    row_y: dict[int, float] = {}
+    y = 0.0
+    for r in rows:
+        row_y[r] = y
+        y += row_h[r]
+
+    ox, oy, scale = origin
+    cv.saveState()
+    cv.translate(ox, oy)
+    cv.scale(scale, scale)
+
+    # Peças a desenhar: (célula de estilo, x, y, w, h, com_texto). Mescla que começa antes
+    # desta página/faixa aparece como continuação (fundo e bordas, texto só na âncora)
+    cells: list[tuple[Any, float, float, float, float, bool]] = []
+    for r in rows:
+        for c in band:
+            anchor = owner.get((r, c))
+            if anchor is not None:
+                if (r, c) != (max(anchor[0], first_row), max(anchor[1], first_col)):
+                    continue
+                ar, ac = anchor
+                end_c, end_r = anchors[anchor]
+                with_text = False
+            else:
+                ar, ac = r, c
+                end_c, end_r = anchors.get((r, c), (c, r))
+                with_text = True
+            end_c, end_r = min(end_c, last_col), min(end_r, last_row)  # corte na quebra de página
+            w = sum(col_w[k] for k in range(c, end_c + 1))
+            h = sum(row_h[k] for k in range(r, end_r + 1))
+            if w == 0.0 or h == 0.0:
+                continue
+            cells.append((ws.cell(row=ar, column=ac), col_x[c], -row_y[r] - h, w, h, with_text))
+
+    # Três passadas: preenchimentos, textos e bordas (bordas por cima)
+    for cell, cx, cy, w, h, _ in cells:
+        fill = cell.fill
+        if fill is not None and fill.fill_type == "solid":
+            rgb = _rgb(fill.fgColor, theme)
+            if rgb:
+                cv.setFillColorRGB(*rgb)
+                cv.rect(cx, cy, w, h, stroke=0, fill=1)
+
+    for cell, cx, cy, w, h, with_text in cells:
+        text = format_value(cell.value, cell.number_format) if with_text else ""
+        if not text:
+            continue
+        font, al = cell.font, cell.alignment
+        size = float(font.sz or 11)
+        fname = _font_name(bool(font.b), bool(font.i))
+        cv.setFillColorRGB(*(_rgb(font.color, theme) or (0, 0, 0)))
+        cv.setFont(fname, size)
+
+        # Texto girado (1–90 anti-horário, 91–180 horário): centralizado na célula
+        rotation = int(al.textRotation or 0)
+        if 0 < rotation <= 180:
+            angle = rotation if rotation <= 90 else 90 - rotation
+            cv.saveState()
+            p = cv.beginPath()
+            p.rect(cx, cy, w, h)
+            cv.clipPath(p, stroke=0, fill=0)
+            cv.translate(cx + w / 2, cy + h / 2)
+            cv.rotate(angle)
+            cv.drawCentredString(0, -size * 0.35, " ".join(text.split()))
+            cv.restoreState()
+            continue
+
+        inner_w = max(w - 2 * _PAD, 1.0)
+        if al.wrap_text:
+            lines = []
+            for part in text.split("\n"):
+                lines.extend(simpleSplit(part, fname, size, inner_w) or [""])
+        else:
+            lines = text.split("\n")
+        leading = size * 1.2
+        block_h = leading * len(lines)
+        vert = al.vertical or "bottom"
+        if vert == "top":
+            base = cy + h - _PAD - size
+        elif vert in ("center", "justify", "distributed"):
+            base = cy + (h + block_h) / 2 - size
+        else:
+            base = cy + _PAD + block_h - leading + size * 0.2
+
+        horiz = al.horizontal or "general"
+        if horiz == "general":
+            horiz = "right" if isinstance(cell.value, (int, float, datetime, date)) and not isinstance(cell.value, bool) else "left"
+        indent = float(al.indent or 0) * 9.0
+
+        # Texto sem quebra transborda para as vizinhas vazias, como no Excel
+        clip_x, clip_w = cx, w
+        row = cell.row
+        if not al.wrap_text and (row, cell.column) not in anchors:
+            step = 1 if horiz == "left" else -1 if horiz == "right" else 0
+            c = cell.column + step
+            while step and first_col <= c <= last_col and (row, c) not in owner \
+                    and (row, c) not in anchors and ws.cell(row=row, column=c).value is None:
+                if step < 0:
+                    clip_x -= col_w[c]
+                clip_w += col_w[c]
+                c += step
+
+        cv.saveState()
+        p = cv.beginPath()
+        p.rect(clip_x, cy, clip_w, h)
+        cv.clipPath(p, stroke=0, fill=0)
+        for i, line in enumerate(lines):
+            ly = base - i * leading
+            if horiz in ("center", "centerContinuous"):
+                cv.drawCentredString(cx + w / 2, ly, line)
+            elif horiz == "right":
+                cv.drawRightString(cx + w - _PAD - indent, ly, line)
+            else:
+                cv.drawString(cx + _PAD + indent, ly, line)
+        cv.restoreState()
+
+    for cell, cx, cy, w, h, _ in cells:
+        # Em mesclas o Excel usa a borda das células da borda externa; aqui, a da
+        # âncora (para direita/baixo, a da célula no canto correspondente)
+        end_c, end_r = anchors.get((cell.row, cell.column), (cell.column, cell.row))
+        end_c, end_r = min(end_c, last_col), min(end_r, last_row)
+        edges = (
+            (cell.border.top, cx, cy + h, cx + w, cy + h),
+            (cell.border.left, cx, cy, cx, cy + h),
+            (_side(ws.cell(row=end_r, column=end_c).border.bottom, cell.border.bottom), cx, cy, cx + w, cy),
+            (_side(ws.cell(row=cell.row, column=end_c).border.right, cell.border.right), cx + w, cy, cx + w, cy + h),
+        )
+        for side, x1, y1, x2, y2 in edges:
+            style = getattr(side, "style", None)
+            if not style:
+                continue
+            cv.setStrokeColorRGB(*(_rgb(side.color, theme) or (0, 0, 0)))
+            cv.setLineWidth(_BORDER_WIDTHS.get(style, 0.5))
+            cv.setDash(list(_BORDER_DASHES.get(style, ())))
+            cv.line(x1, y1, x2, y2)
+    cv.setDash()
+    cv.restoreState()
@@ -0,0 +1,101 @@
+# =========================
+# file: src/job.py
+# Contexto por execução: paths explícitos, workspace isolado e publicação atômica
+# (substitui a mutação de config + reload do post_process)
+# =========================
+from __future__ import annotations
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+import config
+from supervisor import ConversionSupervisor, default_supervisor
+
+logger = logging.getLogger("job")
+
+
+class JobContext:
+    """Tudo que uma geração de contrato precisa, passado explicitamente ao pipeline.
+
+    Cada job tem id único e um workspace próprio em ``output_dir``; dois jobs no mesmo
+    processo (ou no mesmo minuto) não compartilham arquivos temporários nem saídas.
+    Use como context manager para garantir a remoção do workspace.
+    """
+
+    def __init__(
+        self,
+        *,
+        excel_path: Optional[Path] = None,
+        output_dir: Optional[Path] = None,
+        template_path: Optional[Path] = None,
+        mapping: Optional[dict[str, tuple[str, str]]] = None,
+        linearize: Optional[bool] = None,
+        supervisor: Optional[ConversionSupervisor] = None,
+    ):
+        # Defaults lidos do config na criação (não no import); por quê: sem reload de módulo
+        self.excel_path = Path(excel_path or config.EXCEL_PATH)
+        self.output_dir = Path(output_dir or config.OUTPUT_DIR)
+        self.template_path = Path(template_path or config.TEMPLATE_PATH)
+        self.mapping = dict(config.MAPPING if mapping is None else mapping)
+        self.linearize = config.LINEARIZE_PDF if linearize is None else linearize
+        self.supervisor = supervisor or default_supervisor(self.output_dir / "_quarentena")
+
+        now = datetime.now()
+        self.stamp = now.strftime("%d-%m-%y_%H-%M-%S")
+        self.id = f"{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.workspace = self.output_dir / f"_job_{self.id}"
+
+    def __enter__(self) -> "JobContext":
+        self.workspace.mkdir(parents=True, exist_ok=False)
+        logger.info(f"Job {self.id}: workspace {self.workspace}")
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.cleanup()
+
+    @property
+    def filled_docx(self) -> Path:
+        """DOCX preenchido do job (dentro do workspace)."""
+        return self.workspace / f"ContratoPreenchido_{self.stamp}.docx"
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def publish(self, src: Path, name: str) -> Path:
+        """Move ``src`` do workspace para ``output_dir/name`` de forma atômica.
+        Nunca sobrescreve: se o nome já existir, acrescenta um sufixo (_2, _3, ...).
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        target = self.output_dir / name
+        stem, suffix = target.stem, target.suffix
+        n = 1
+        while True:
+            try:
+                # por quê: link é atômico e falha se o destino existir (sem corrida entre jobs)
+                os.link(src, target)
+                os.unlink(src)
+                break
+            except FileExistsError:
+                n += 1
+                target = self.output_dir / f"{stem}_{n}{suffix}"
+            except OSError:
+                # Sistemas sem hard link (ex.: alguns compartilhamentos de rede): reserva o
+                # nome com O_EXCL (criação atômica) e só então substitui o arquivo reservado
+                try:
+                    fd = os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                except FileExistsError:
+                    n += 1
+                    target = self.output_dir / f"{stem}_{n}{suffix}"
+                    continue
+                os.close(fd)
+                try:
+                    os.replace(src, target)
+                except OSError:
+                    target.unlink(missing_ok=True)  # por quê: não deixar a reserva vazia na saída
+                    raise
+                break
+        logger.info(f"Job {self.id}: publicado {target}")
+        return target
@@ -1,8 +1,8 @@
 import logging
-from datetime import datetime
 from pathlib import Path
-from config import (MAPPING, EXCEL_PATH, TEMPLATE_PATH, OUTPUT_DIR, INPUT_DIR, BASE_DIR)
+from config import (EXCEL_PATH, TEMPLATE_PATH, OUTPUT_DIR, INPUT_DIR, BASE_DIR)
 from excel_reader import ExcelReader
+from job import JobContext
 from word_writer import WordWriter
 
 # NOVO: pós-processamento automático
@@ -45,32 +45,30 @@ def main() -> None:
         logger.error("Interrompido por paths inválidos.")
         return
 
-    # coleta do Excel
-    replacements = {}
-    try:
-        with ExcelReader(EXCEL_PATH) as reader:
-            for marker, (sheet, cell) in MAPPING.items():
-                value = reader.get_cell_value(sheet, cell)
-                replacements[marker] = value
-                logger.info(f"Coletado: {marker} → {value}")
-    except Exception as e:
-        logger.error(f"Falha na leitura do Excel: {e}")
-        return
-
-    timestamp = datetime.now().strftime("%d-%m-%y_%H-%M")
-    output_path = Path(OUTPUT_DIR) / f"ContratoPreenchido_{timestamp}.docx"
+    with JobContext() as job:
+        # coleta do Excel
+        try:
+            with ExcelReader.from_job(job) as reader:
+                replacements = reader.read_mapping(job.mapping)
+        except Exception as e:
+            logger.error(f"Falha na leitura do Excel: {e}")
+            return
 
-    writer = WordWriter(TEMPLATE_PATH)
-    if writer.replace_in_document(replacements, output_path):
-        logger.info("DOCX gerado com sucesso. Iniciando pós-processamento (PDF final).")
-        # >>> NOVO: chama o pipeline para exportar áreas do Excel e mesclar tudo
-        final_pdf = build_final_pdf(output_path)
-        if final_pdf:
-            logger.info(f"Processo concluído! PDF final: {final_pdf}")
+        writer = WordWriter.from_job(job)
+        if writer.replace_in_document(replacements, job.filled_docx):
+            logger.info("DOCX gerado com sucesso. Iniciando pós-processamento (PDF final).")
+            try:
+                # >>> NOVO: chama o pipeline para exportar áreas do Excel e mesclar tudo
+                final_pdf = build_final_pdf(job.filled_docx, job=job)
+                if final_pdf:
+                    logger.info(f"Processo concluído! PDF final: {final_pdf}")
+                else:
+                    logger.error("Pós-processamento falhou.")
+            finally:
+                # DOCX preenchido também fica na saída
+                job.publish(job.filled_docx, job.filled_docx.name)
         else:
-            logger.error("Pós-processamento falhou.")
-    else:
-        logger.error("Falha na geração do contrato")
+            logger.error("Falha na geração do contrato")
 
 if __name__ == "__main__":
     main()
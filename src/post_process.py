@@ -1,19 +1,26 @@
 # =========================
 # file: src/post_process.py
 # Ajustes mínimos: sem criação de arquivo .log e limpeza garantida do tmp_dir
+# Paths vêm do JobContext (sem globals do config nem reload do módulo)
 # =========================
 from __future__ import annotations
 import logging
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
 from typing import Iterable, Optional
-from config import BASE_DIR, EXCEL_PATH, OUTPUT_DIR
+from config import EXCEL_RANGES
+from excel_renderer import render_range_to_pdf
+from job import JobContext
+from supervisor import ConversionSupervisor, office_pid, register_child_pid, release_child_pid
 
 # Use o logger do app (sem FileHandler aqui)
 logger = logging.getLogger("post_process")
 
-def _ts() -> str:
-    return datetime.now().strftime("%d-%m-%y")
+# por quê: check_linearization troca o sys.stderr do processo; jobs paralelos (threads)
+# não podem salvar/restaurar o stream uns dos outros
+_STDERR_LOCK = threading.Lock()
 
 def _convert_docx_to_pdf(docx_path: Path, out_pdf: Path) -> None:
     """Usa Word COM diretamente; por quê: evitar travas do docx2pdf."""
@@ -21,9 +28,12 @@ def _convert_docx_to_pdf(docx_path: Path, out_pdf: Path) -> None:
     import pythoncom
     pythoncom.CoInitialize()
     word = None
+    word_pid = None
     try:
         import win32com.client as win32  # type: ignore
         word = win32.DispatchEx("Word.Application")
+        word_pid = office_pid(word)
+        register_child_pid(word_pid)  # por quê: supervisor mata o WINWORD se travar
         word.Visible = False
         word.DisplayAlerts = 0
         doc = word.Documents.Open(str(docx_path))
@@ -38,6 +48,7 @@ def _convert_docx_to_pdf(docx_path: Path, out_pdf: Path) -> None:
         if word is not None:
             try:
                 word.Quit()
+                release_child_pid(word_pid)
             except Exception:
                 pass
         pythoncom.CoUninitialize()
@@ -47,8 +58,11 @@ def _export_excel_range_to_pdf(xlsm: Path, sheet: str, rng: str, out_pdf: Path,
     import win32com.client as win32  # type: ignore
     pythoncom.CoInitialize()
     excel = None
+    excel_pid = None
     try:
         excel = win32.DispatchEx("Excel.Application")
+        excel_pid = office_pid(excel)
+        register_child_pid(excel_pid)  # por quê: supervisor mata o EXCEL se travar
         excel.Visible = False
         excel.ScreenUpdating = False
         excel.DisplayAlerts = False
@@ -77,57 +91,139 @@ def _export_excel_range_to_pdf(xlsm: Path, sheet: str, rng: str, out_pdf: Path,
     finally:
         if excel is not None:
             excel.Quit()
+            release_child_pid(excel_pid)
         pythoncom.CoUninitialize()
 
-def _merge_pdfs(pdf_paths: Iterable[Path], out_pdf: Path) -> None:
+def _linearize_pdf(src_pdf: Path, out_pdf: Path) -> None:
+    """Regrava o PDF linearizado (fast web view) via qpdf/pikepdf.
+    por quê: visualizador da intranet só mostra a página 1 após baixar tudo;
+    com hint tables e objetos da primeira página no início, abre antes.
+    """
+    import pikepdf  # type: ignore
+    out_pdf.parent.mkdir(parents=True, exist_ok=True)
+    with pikepdf.open(str(src_pdf)) as pdf:
+        pdf.save(str(out_pdf), linearize=True)
+    logger.info(f"PDF linearizado: {out_pdf}")
+
+def _verify_linearized(pdf_path: Path) -> bool:
+    """Confere se o PDF abre sem erros estruturais e se a linearização é válida."""
+    import io
+    import sys
+    import pikepdf  # type: ignore
+    try:
+        with pikepdf.open(str(pdf_path)) as pdf:
+            # por quê: pikepdf ≥ 10 renomeou Pdf.check para Pdf.check_pdf_syntax
+            check = getattr(pdf, "check_pdf_syntax", None) or pdf.check
+            problems = check()
+            if problems:
+                logger.error(f"PDF inválido ({pdf_path}): {'; '.join(map(str, problems))}")
+                return False
+            if not pdf.is_linearized:
+                logger.error(f"PDF não está linearizado: {pdf_path}")
+                return False
+            report = io.StringIO()
+            with _STDERR_LOCK:
+                saved_stderr = sys.stderr
+                try:
+                    linear_ok = pdf.check_linearization(stream=report)
+                finally:
+                    # por quê: pikepdf troca sys.stderr pelo stream e não restaura
+                    sys.stderr = saved_stderr
+            if not linear_ok:
+                logger.error(f"Linearização inconsistente ({pdf_path}): {report.getvalue().strip()}")
+                return False
+        return True
+    except Exception as e:
+        logger.error(f"Falha ao verificar PDF ({pdf_path}): {e}")
+        return False
+
+def _merge_pdfs(pdf_paths: Iterable[Path], out_pdf: Path, *, linearize: bool = False) -> None:
     from PyPDF2 import PdfMerger
     out_pdf.parent.mkdir(parents=True, exist_ok=True)
+    # Linearizado: mescla num arquivo intermediário e só então gera o final
+    merged_pdf = out_pdf.with_name(f"_{out_pdf.stem}.merged.pdf") if linearize else out_pdf
     merger = PdfMerger()
     try:
         for p in pdf_paths:
             if not p.exists():
                 raise FileNotFoundError(f"PDF ausente: {p}")
             merger.append(str(p))
-        with open(out_pdf, "wb") as fp:
+        with open(merged_pdf, "wb") as fp:
             merger.write(fp)
-        logger.info(f"PDF final: {out_pdf}")
     finally:
         merger.close()
 
-def build_final_pdf(filled_docx: Optional[Path] = None) -> Optional[Path]:
-    """Executa todo o pós-processo e retorna o caminho do PDF final (apenas ele fica salvo)."""
-    if not EXCEL_PATH.exists():
-        logger.error(f"Excel não encontrado: {EXCEL_PATH}")
+    if linearize:
+        try:
+            _linearize_pdf(merged_pdf, out_pdf)
+            if not _verify_linearized(out_pdf):
+                raise RuntimeError(f"Verificação da linearização falhou: {out_pdf}")
+        finally:
+            merged_pdf.unlink(missing_ok=True)
+    logger.info(f"PDF final: {out_pdf}")
+
+def build_final_pdf(
+    filled_docx: Optional[Path] = None,
+    *,
+    job: Optional[JobContext] = None,
+    linearize: Optional[bool] = None,
+    supervisor: Optional[ConversionSupervisor] = None,
+) -> Optional[Path]:
+    """Executa todo o pós-processo e retorna o caminho do PDF final (apenas ele fica salvo).
+    Paths, workspace e publicação vêm de ``job``; sem ele, cria um job a partir do config.
+    ``linearize``/``supervisor`` sobrescrevem os do job (PDF linearizado; prazo, retry, quarentena).
+    """
+    if job is None:
+        with JobContext() as own_job:
+            return build_final_pdf(filled_docx, job=own_job, linearize=linearize, supervisor=supervisor)
+
+    excel_path = job.excel_path
+    if not excel_path.exists():
+        logger.error(f"Excel não encontrado: {excel_path}")
         return None
 
     if filled_docx is None:
-        docs = sorted(OUTPUT_DIR.glob("ContratoPreenchido_*.docx"), key=lambda p: p.stat().st_mtime, reverse=True)
+        docs = sorted(job.output_dir.glob("ContratoPreenchido_*.docx"), key=lambda p: p.stat().st_mtime, reverse=True)
         if not docs:
-            logger.error("Nenhum DOCX encontrado em data/output.")
+            logger.error(f"Nenhum DOCX encontrado em {job.output_dir}.")
             return None
         filled_docx = docs[0]
 
-    ts = _ts()
-    tmp_dir = OUTPUT_DIR / f"_finalData_{ts}"
+    tmp_dir = job.workspace / "_finalData"
     tmp_dir.mkdir(parents=True, exist_ok=True)
 
     pdf_docx = tmp_dir / "01_contrato.docx.pdf"
-    pdf_quadro = tmp_dir / "02_quadro.pdf"
-    pdf_crono = tmp_dir / "03_cronograma.pdf"
-    pdf_check = tmp_dir / "04_checklist.pdf"
-    final_pdf = OUTPUT_DIR / f"ContratoFinal_{ts}.pdf"
+    range_pdfs = [tmp_dir / name for _, _, name, _, _ in EXCEL_RANGES]
+    merged_pdf = tmp_dir / "final.pdf"
 
+    sup = supervisor or job.supervisor
+    native = [(r, out) for r, out in zip(EXCEL_RANGES, range_pdfs) if r[4] == "native"]
+    com = [(r, out) for r, out in zip(EXCEL_RANGES, range_pdfs) if r[4] != "native"]
     try:
-        _convert_docx_to_pdf(filled_docx, pdf_docx)
-        _export_excel_range_to_pdf(EXCEL_PATH, "QUADRO DE CONCORRENCIA", "A1:K133", pdf_quadro, landscape=False)
-        _export_excel_range_to_pdf(EXCEL_PATH, "CRONOGRAMA", "B2:T26", pdf_crono, landscape=True)
-        _export_excel_range_to_pdf(EXCEL_PATH, "QUALIFICACAO", "B2:E36", pdf_check, landscape=False)
-        _merge_pdfs([pdf_docx, pdf_quadro, pdf_crono, pdf_check], final_pdf)
-        return final_pdf
+        # Áreas nativas renderizam em paralelo (um processo cada) enquanto Word/Excel COM seguem em série
+        with ThreadPoolExecutor(max_workers=max(1, len(native))) as pool:
+            futures = [
+                pool.submit(
+                    sup.run, "native", excel_path, render_range_to_pdf,
+                    excel_path, sheet, rng, out, landscape=land, run_id=job.id,
+                )
+                for (sheet, rng, _, land, _), out in native
+            ]
+            # por quê: o DOCX preenchido é novo a cada job; o que se repete é planilha + template
+            sup.run(
+                "docx", filled_docx, _convert_docx_to_pdf, filled_docx, pdf_docx,
+                run_id=job.id, inputs=(excel_path, job.template_path),
+            )
+            for (sheet, rng, _, land, _), out in com:
+                sup.run(
+                    "excel", excel_path, _export_excel_range_to_pdf,
+                    excel_path, sheet, rng, out, landscape=land, run_id=job.id,
+                )
+            for f in futures:
+                f.result()
+        _merge_pdfs([pdf_docx, *range_pdfs], merged_pdf, linearize=job.linearize if linearize is None else linearize)
+        # Publicação atômica: o PDF só aparece na saída quando está completo
+        return job.publish(merged_pdf, f"ContratoFinal_{job.stamp}.pdf")
     finally:
         # Limpeza garantida do diretório temporário
-        try:
-            import shutil
-            shutil.rmtree(tmp_dir, ignore_errors=True)
-        except Exception:
-            pass
+        shutil.rmtree(tmp_dir, ignore_errors=True)
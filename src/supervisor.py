@@ -0,0 +1,372 @@
+# =========================
+# file: src/supervisor.py
+# Supervisor das conversões Office: prazo por etapa, kill de WINWORD/EXCEL travados,
+# retry com backoff e quarentena de entradas que falham repetidamente
+# =========================
+from __future__ import annotations
+import json
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+from config import (
+    CONVERSION_TIMEOUTS,
+    CONVERSION_RETRIES,
+    CONVERSION_BACKOFF,
+    QUARANTINE_AFTER,
+    QUARANTINE_DIR,
+)
+
+logger = logging.getLogger("supervisor")
+
+# Canal do worker para o supervisor (definido apenas dentro do processo filho)
+_PID_SINK: Optional[Any] = None
+
+# Etapas que não abrem Office (openpyxl/reportlab): nunca há WINWORD/EXCEL para matar
+NATIVE_STAGES = frozenset({"native"})
+
+
+class ConversionTimeout(RuntimeError):
+    """Etapa excedeu o prazo; processo filho e Office foram encerrados."""
+
+
+class ConversionFailed(RuntimeError):
+    """Etapa falhou em todas as tentativas."""
+
+
+class QuarantinedInput(RuntimeError):
+    """Entrada em quarentena após falhas repetidas; não é reprocessada."""
+
+
+def register_child_pid(pid: Optional[int]) -> None:
+    """Informa ao supervisor o PID do WINWORD/EXCEL aberto pelo worker.
+    Fora de um worker supervisionado não faz nada.
+    """
+    _send("pid", pid)
+
+
+def release_child_pid(pid: Optional[int]) -> None:
+    """Office encerrado normalmente (Quit); o supervisor não precisa mais matá-lo."""
+    _send("released", pid)
+
+
+def _send(kind: str, pid: Optional[int]) -> None:
+    if _PID_SINK is None or not pid:
+        return
+    try:
+        _PID_SINK.send((kind, int(pid)))
+    except Exception:
+        pass
+
+
+def office_pid(app: Any) -> Optional[int]:
+    """PID do processo por trás de um objeto COM do Office.
+    Excel expõe ``Application.Hwnd``; Word não, então a janela "OpusApp" é localizada
+    por um título único atribuído a ``Application.Caption``. Sem PID, o reaping fica
+    desligado para a conversão (aviso no log).
+    """
+    pid, reason = _find_office_pid(app)
+    if pid is None:
+        try:
+            name = str(app.Name)
+        except Exception:
+            name = "Office"
+        logger.warning(f"PID do {name} não identificado ({reason}); se travar, o processo "
+                       f"não será encerrado pelo supervisor")
+    return pid
+
+
+def _find_office_pid(app: Any) -> tuple[Optional[int], str]:
+    try:
+        import win32gui  # type: ignore
+        import win32process  # type: ignore
+    except Exception:
+        return None, "pywin32 indisponível"
+    try:
+        hwnd = int(app.Hwnd)
+    except Exception:
+        try:
+            caption = f"ContratoRPA-{os.getpid()}-{uuid.uuid4().hex}"
+            app.Caption = caption
+            hwnd = win32gui.FindWindow("OpusApp", caption)
+        except Exception as e:
+            return None, f"janela não encontrada: {e}"
+    if not hwnd:
+        return None, "janela não encontrada"
+    try:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+    except Exception as e:
+        return None, f"GetWindowThreadProcessId falhou: {e}"
+    return (int(pid), "") if pid else (None, "PID zero")
+
+
+def _kill_pid(pid: int) -> None:
+    try:
+        if sys.platform == "win32":
+            done = subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True, timeout=15)
+            if done.returncode != 0:
+                return  # já tinha saído
+        else:
+            os.kill(pid, signal.SIGKILL)
+        logger.warning(f"Processo encerrado à força: PID {pid}")
+    except Exception:
+        pass
+
+
+class _PipeLogHandler(logging.Handler):
+    """Repassa os logs do worker ao supervisor (por quê: o processo filho não tem os
+    handlers do app; sem isso as etapas somem do painel "Etapas" e do contrato_rpa.log).
+    """
+
+    def __init__(self, sink: Any):
+        super().__init__()
+        self.sink = sink
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = {
+                "name": record.name, "levelno": record.levelno, "levelname": record.levelname,
+                "msg": record.getMessage(), "created": record.created, "msecs": record.msecs,
+                "pathname": record.pathname, "lineno": record.lineno, "funcName": record.funcName,
+                "process": record.process, "processName": record.processName,
+            }
+            if record.exc_info:
+                data["exc_text"] = logging.Formatter().formatException(record.exc_info)
+            self.sink.send(("log", data))
+        except Exception:
+            self.handleError(record)
+
+
+def _relay_log(data: dict) -> None:
+    record = logging.makeLogRecord(data)
+    logging.getLogger(record.name).handle(record)
+
+
+def _worker(sink: Any, log_level: int, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+    global _PID_SINK
+    _PID_SINK = sink
+    root = logging.getLogger()
+    root.handlers = [_PipeLogHandler(sink)]
+    root.setLevel(log_level)
+    try:
+        func(*args, **kwargs)
+        sink.send(("done", None))
+    except BaseException as e:
+        sink.send(("error", f"{type(e).__name__}: {e}"[:2000]))
+
+
+class ConversionSupervisor:
+    """Executa cada conversão num processo filho com prazo, retry e quarentena.
+
+    ``func`` deve ser uma função de módulo (picklable); os testes usam os backends
+    falsos de ``tests/fake_backends.py`` (travar, falhar, morrer, abrir "Office").
+    Contagem de falhas e quarentena ficam gravadas em ``quarantine_dir/estado.json``:
+    valem entre processos (main.py roda um job por processo) e após reiniciar.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeouts: Optional[dict[str, float]] = None,
+        retries: int = CONVERSION_RETRIES,
+        backoff: float = CONVERSION_BACKOFF,
+        quarantine_after: int = QUARANTINE_AFTER,
+        quarantine_dir: Path = QUARANTINE_DIR,
+    ):
+        self.timeouts = dict(CONVERSION_TIMEOUTS if timeouts is None else timeouts)
+        self.retries = retries
+        self.backoff = backoff
+        self.quarantine_after = quarantine_after
+        self.quarantine_dir = Path(quarantine_dir)
+        self._failures: dict[str, set[str]] = {}  # chave → execuções (run_id) que falharam
+        self._quarantined: dict[str, dict[str, str]] = {}  # chave → etapa, arquivo, quando
+        # por quê: o mesmo supervisor atende threads (áreas nativas) e jobs simultâneos
+        self._lock = threading.Lock()
+        self._ctx = mp.get_context("spawn")  # por quê: COM não sobrevive a fork
+
+    @property
+    def state_file(self) -> Path:
+        return self.quarantine_dir / "estado.json"
+
+    @staticmethod
+    def _key(stage: str, inputs: Sequence[Path]) -> str:
+        # por quê: as mesmas entradas corrigidas (mtime/tamanho novos) saem da quarentena, e a
+        # falha de uma etapa (ex.: "native") não bloqueia a mesma planilha em outra ("excel")
+        parts = [stage]
+        for path in inputs:
+            try:
+                st = path.stat()
+                parts.append(f"{path.resolve()}|{st.st_mtime_ns}|{st.st_size}")
+            except OSError:
+                parts.append(str(path))
+        return "|".join(parts)
+
+    def _load_state(self) -> None:
+        """Mescla o estado gravado (outro processo, execução anterior). Chamar com o lock."""
+        try:
+            data = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for key, runs in data.get("failures", {}).items():
+            self._failures.setdefault(key, set()).update(runs)
+        for key, info in data.get("quarantined", {}).items():
+            self._quarantined.setdefault(key, info)
+
+    def _save_state(self) -> None:
+        """Grava o estado de forma atômica (arquivo temporário + replace). Chamar com o lock."""
+        data = {
+            "failures": {k: sorted(v) for k, v in self._failures.items()},
+            "quarantined": self._quarantined,
+        }
+        try:
+            self.quarantine_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_name(f".estado.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o estado da quarentena ({self.state_file}): {e}")
+
+    def is_quarantined(self, stage: str, src: Path, inputs: Optional[Sequence[Path]] = None) -> bool:
+        key = self._key(stage, [Path(p) for p in inputs] if inputs else [Path(src)])
+        with self._lock:
+            self._load_state()
+            return key in self._quarantined
+
+    def run(
+        self,
+        stage: str,
+        src: Path,
+        func: Callable[..., Any],
+        *args: Any,
+        run_id: Optional[str] = None,
+        inputs: Optional[Sequence[Path]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Roda ``func(*args, **kwargs)`` supervisionado; ``src`` é o arquivo convertido.
+
+        ``inputs`` identifica a entrada para a quarentena quando ``src`` muda a cada job
+        (ex.: o DOCX preenchido no workspace → planilha + template); padrão: ``src``.
+        Falhas com o mesmo ``run_id`` (ex.: várias áreas da planilha no mesmo job) contam
+        uma vez só; sem ``run_id`` cada chamada conta como uma execução.
+        """
+        src = Path(src)
+        key = self._key(stage, [Path(p) for p in inputs] if inputs else [src])
+        with self._lock:
+            self._load_state()
+            if key in self._quarantined:
+                raise QuarantinedInput(f"Entrada em quarentena ({stage}): {src}")
+
+        timeout = self.timeouts.get(stage, self.timeouts.get("default", 300.0))
+        last_error = ""
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = self.backoff * (2 ** (attempt - 1))
+                logger.warning(f"[{stage}] nova tentativa {attempt + 1}/{self.retries + 1} em {delay:.1f}s")
+                time.sleep(delay)
+            try:
+                self._run_once(stage, timeout, func, args, kwargs)
+                with self._lock:
+                    self._load_state()
+                    if self._failures.pop(key, None) is not None:
+                        self._save_state()
+                return
+            except (ConversionTimeout, ConversionFailed) as e:
+                last_error = str(e)
+                logger.error(f"[{stage}] tentativa {attempt + 1} falhou: {e}")
+
+        with self._lock:
+            self._load_state()
+            failed_runs = self._failures.setdefault(key, set())
+            failed_runs.add(run_id or uuid.uuid4().hex)
+            newly = len(failed_runs) >= self.quarantine_after and key not in self._quarantined
+            if newly:
+                self._quarantined[key] = {"etapa": stage, "arquivo": str(src),
+                                          "quando": time.strftime("%Y-%m-%d %H:%M:%S")}
+            self._save_state()
+        if newly:
+            self._quarantine(stage, src)  # cópia fora do lock (I/O)
+        raise ConversionFailed(f"[{stage}] falhou após {self.retries + 1} tentativas: {last_error}")
+
+    def _run_once(self, stage: str, timeout: float, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        # por quê: Pipe envia na hora (Queue usa thread e perde o PID se o worker morrer logo)
+        reader, sink = self._ctx.Pipe(duplex=False)
+        level = logging.getLogger().getEffectiveLevel()
+        proc = self._ctx.Process(target=_worker, args=(sink, level, func, args, kwargs), daemon=True)
+        proc.start()
+        sink.close()  # só o worker escreve; com ele morto, o reader recebe EOF
+
+        # Mensagens do worker até o desfecho: logs, PIDs do Office abertos/liberados e
+        # done/error. Lidas durante a execução (por quê: pipe cheio de logs travaria o worker)
+        pids: set[int] = set()
+        status, detail = None, None
+        deadline = time.monotonic() + timeout
+        hung = False
+        try:
+            while status is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    hung = True
+                    break
+                try:
+                    if not reader.poll(remaining):
+                        continue
+                    kind, value = reader.recv()
+                except (EOFError, OSError):
+                    break  # worker morreu sem desfecho
+                if kind == "log":
+                    _relay_log(value)
+                elif kind == "pid":
+                    pids.add(value)
+                elif kind == "released":
+                    pids.discard(value)
+                else:
+                    status, detail = kind, value
+        finally:
+            if hung:
+                proc.kill()
+            proc.join(5)
+            if proc.is_alive():
+                proc.kill()
+                proc.join(5)
+            reader.close()
+
+        # Reaping: só o Office que este worker registrou e não encerrou (nunca em etapa nativa)
+        if stage in NATIVE_STAGES:
+            pids.clear()
+        for pid in pids:
+            _kill_pid(pid)
+
+        if hung:
+            raise ConversionTimeout(f"[{stage}] sem resposta após {timeout:g}s")
+        if status != "done":
+            raise ConversionFailed(str(detail or f"worker saiu com código {proc.exitcode}"))
+
+    def _quarantine(self, stage: str, src: Path) -> None:
+        try:
+            self.quarantine_dir.mkdir(parents=True, exist_ok=True)
+            dest = self.quarantine_dir / f"{time.strftime('%Y%m%d-%H%M%S')}_{stage}_{src.name}"
+            shutil.copy2(src, dest)
+            logger.error(f"[{stage}] entrada em quarentena: {src} → {dest}")
+        except Exception as e:
+            logger.error(f"[{stage}] entrada em quarentena (cópia falhou: {e}): {src}")
+
+
+_defaults: dict[Path, ConversionSupervisor] = {}
+_defaults_lock = threading.Lock()
+
+
+def default_supervisor(quarantine_dir: Optional[Path] = None) -> ConversionSupervisor:
+    """Supervisor compartilhado por pasta de quarentena; mantém contagem de falhas ao longo do lote."""
+    key = Path(quarantine_dir or QUARANTINE_DIR)
+    with _defaults_lock:
+        if key not in _defaults:
+            _defaults[key] = ConversionSupervisor(quarantine_dir=key)
+        return _defaults[key]
@@ -1,12 +1,20 @@
 import logging
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 from docx import Document
 
+if TYPE_CHECKING:
+    from job import JobContext
+
 class WordWriter:
     def __init__(self, template_path):
         self.template_path = str(template_path)
         self.logger = logging.getLogger(__name__)
 
+    @classmethod
+    def from_job(cls, job: "JobContext") -> "WordWriter":
+        """Escritor com o template do job (por quê: path explícito, sem globals do config)."""
+        return cls(job.template_path)
+
     def replace_in_document(self, replacements: Dict[str, str], output_path) -> bool:
         try:
             doc = Document(self.template_path)
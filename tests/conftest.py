@@ -0,0 +1,10 @@
+# =========================
+# file: tests/conftest.py
+# Módulos do projeto ficam em src/ (sem pacote); expõe no sys.path para os testes
+# =========================
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
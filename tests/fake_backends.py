@@ -0,0 +1,72 @@
+# =========================
+# file: tests/fake_backends.py
+# Backends falsos para o supervisor (funções de módulo: o worker usa spawn e precisa importá-las)
+# =========================
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from supervisor import register_child_pid, release_child_pid
+
+
+def ok(out: Path) -> None:
+    Path(out).write_text("ok")
+
+
+def hang(out: Path) -> None:
+    Path(out).write_text(str(os.getpid()))  # PID do worker, para o teste conferir o kill
+    time.sleep(600)
+
+
+def chatty(lines: int, out: Path) -> None:
+    """Loga bastante (mais que o buffer do pipe) antes de concluir."""
+    log = logging.getLogger("post_process")
+    for i in range(lines):
+        log.info(f"Excel→PDF linha {i:05d} " + "x" * 200)
+    Path(out).write_text("ok")
+
+
+def boom(out: Path) -> None:
+    raise OSError("arquivo bloqueado")
+
+
+def crash(out: Path) -> None:
+    os._exit(3)  # worker morre sem mandar desfecho
+
+
+def flaky(counter: Path, fail_times: int, out: Path) -> None:
+    """Falha nas ``fail_times`` primeiras chamadas (contagem persistida em ``counter``)."""
+    counter = Path(counter)
+    calls = int(counter.read_text()) if counter.exists() else 0
+    counter.write_text(str(calls + 1))
+    if calls < fail_times:
+        raise RuntimeError(f"falha simulada {calls + 1}")
+    Path(out).write_text("ok")
+
+
+def _fake_office(pid_file: Path) -> subprocess.Popen:
+    """Processo que faz o papel do WINWORD/EXCEL; PID gravado para o teste conferir."""
+    office = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+    Path(pid_file).write_text(str(office.pid))
+    register_child_pid(office.pid)
+    return office
+
+
+def office_hang(pid_file: Path) -> None:
+    _fake_office(pid_file)
+    time.sleep(600)  # ex.: diálogo modal
+
+
+def office_crash(pid_file: Path) -> None:
+    _fake_office(pid_file)
+    os._exit(1)  # worker morre e deixa o Office órfão
+
+
+def office_clean(pid_file: Path) -> None:
+    office = _fake_office(pid_file)
+    office.kill()  # Quit()
+    office.wait()
+    release_child_pid(office.pid)
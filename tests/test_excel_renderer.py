@@ -0,0 +1,283 @@
+# =========================
+# file: tests/test_excel_renderer.py
+# Renderizador nativo: formatos numéricos/data pt-BR, cores de tema, ajuste de página,
+# paginação e corte de células mescladas na quebra
+# =========================
+import re
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from excel_renderer import (
+    _apply_tint,
+    _col_width_pt,
+    _fit_scale,
+    _format_date,
+    _paginate,
+    _rgb,
+    _theme_colors,
+    _title_span,
+    _ui_col_width_pt,
+    format_value,
+    render_range_to_pdf,
+)
+
+CONTABIL = '_-"R$"\\ * #,##0.00_-;\\-"R$"\\ * #,##0.00_-;_-"R$"\\ * "-"??_-;_-@_-'
+MOEDA = '"R$" #,##0.00;[Red]-"R$" #,##0.00'
+
+
+# ---------- números ----------
+@pytest.mark.parametrize("value, expected", [
+    (1234.5, "R$ 1.234,50"),
+    (-1234.5, "-R$ 1.234,50"),
+    (0, "R$ -"),
+    (0.004, "R$ 0,00"),
+    (15247.236, "R$ 15.247,24"),
+])
+def test_accounting_brl(value, expected):
+    assert format_value(value, CONTABIL) == expected
+
+
+def test_accounting_text_section():
+    assert format_value("a definir", CONTABIL) == "a definir"
+
+
+@pytest.mark.parametrize("value, expected", [
+    (5, "R$ 5,00"),
+    (-5, "-R$ 5,00"),
+    (69622.73, "R$ 69.622,73"),
+])
+def test_currency_brl(value, expected):
+    assert format_value(value, MOEDA) == expected
+
+
+@pytest.mark.parametrize("value, fmt, expected", [
+    (0.4, "0%", "40%"),
+    (-0.0502, "0.00%", "-5,02%"),
+    (82.42, "0.00", "82,42"),
+    (2.5, "0", "3"),                    # arredondamento "meio para cima", como o Excel
+    (1234567.8, "#,##0", "1.234.568"),
+    (1234567, "#,##0,", "1.235"),       # vírgula final = divide por mil
+    (0.5, "#.00", ",50"),
+    (-3, "0;(0)", "(3)"),
+    (42, '0 "dias"', "42 dias"),
+    (0, '0;-0;"zero"', "zero"),
+    (1765, "General", "1765"),
+    (10.5, None, "10,5"),
+    (True, "General", "VERDADEIRO"),
+    ("texto", "0.00", "texto"),
+    (None, "0.00", ""),
+    (1e30, "#,##0.00", "1.000.000.000.000.000.000.000.000.000.000,00"),  # além da precisão do Decimal
+    (12345.678, "0.00E+00", "1,23E+04"),
+    (0.000123, "0.00E+00", "1,23E-04"),
+    (9.9999, "0.00E+00", "1,00E+01"),
+    (12345, "##0.0E+0", "12,3E+3"),     # engenharia: expoente múltiplo de 3
+    (0.75, "# ?/?", "3/4"),
+    (2.5, "# ?/?", "2 1/2"),
+    (0.3333, "# ??/??", "1/3"),
+    (0.6, "# ?/8", "5/8"),
+    (5, '[>=100]"big";0', "5"),
+    (500, '[>=100]"big";0', "big"),
+    (-5, '[>=100]"big";0', "-5"),
+    (-5, '[<0]"neg "0;0', "neg 5"),
+    (-5, "0;;", ""),                    # seção vazia esconde o valor
+    (0, "0;;", ""),
+    (5, "0;;", "5"),
+    ("oculto", ";;;", ""),
+    (timedelta(days=1, hours=2), "[h]:mm", "26:00"),
+    (timedelta(minutes=65, seconds=7), "[mm]:ss", "65:07"),
+    (timedelta(hours=26, minutes=5), "h:mm", "2:05"),
+    (timedelta(hours=12), "General", "0,5"),
+    (float("nan"), "0.00", "nan"),
+])
+def test_number_formats(value, fmt, expected):
+    assert format_value(value, fmt) == expected
+
+
+# ---------- datas ----------
+@pytest.mark.parametrize("value, fmt, expected", [
+    (datetime(2024, 6, 28), "dd/mm/yyyy", "28/06/2024"),
+    (datetime(2024, 6, 28), "mm-dd-yy", "28/06/2024"),   # formato 14 = data curta do sistema (pt-BR)
+    (date(2025, 1, 13), "mmm-yy", "jan-25"),
+    (date(2025, 9, 27), 'd "de" mmmm "de" yyyy', "27 de setembro de 2025"),
+    (date(2024, 6, 28), "dddd", "sexta-feira"),
+    (time(7, 5), "hh:mm", "07:05"),
+    (datetime(2024, 6, 28, 16, 0, 9), "h:mm:ss", "16:00:09"),
+])
+def test_date_formats(value, fmt, expected):
+    assert format_value(value, fmt) == expected
+
+
+def test_format_date_minutes_vs_months():
+    assert _format_date(datetime(2024, 3, 1, 10, 7), "m/yyyy h:m") == "3/2024 10:7"
+
+
+# ---------- cores ----------
+def test_theme_color_and_tint(tmp_path):
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.styles.colors import Color
+
+    path = tmp_path / "tema.xlsx"
+    Workbook().save(path)
+    theme = _theme_colors(load_workbook(path))
+    assert theme[0] and theme[1]                     # lt1 / dk1 do tema padrão
+
+    white = _rgb(Color(theme=0), theme)
+    assert white == pytest.approx((1.0, 1.0, 1.0))
+    darker = _rgb(Color(theme=0, tint=-0.5), theme)
+    assert darker == pytest.approx((0.5, 0.5, 0.5))
+    accent = _rgb(Color(theme=4), theme)
+    lighter = _rgb(Color(theme=4, tint=0.6), theme)
+    assert sum(lighter) > sum(accent)
+    assert _rgb(Color(theme=4)) is None              # sem paleta = cor automática
+
+
+def test_rgb_and_indexed():
+    from openpyxl.styles.colors import Color
+    assert _rgb(Color(rgb="FFFF0000")) == pytest.approx((1.0, 0.0, 0.0))
+    assert _rgb(Color(indexed=10)) == pytest.approx((1.0, 0.0, 0.0))
+    assert _rgb(Color(indexed=64)) is None
+    assert _apply_tint((0.2, 0.4, 0.6), 0.0) == (0.2, 0.4, 0.6)
+
+
+# ---------- ajuste de página ----------
+def _ws(fit=False, wide=None, tall=None, scale=None):
+    return SimpleNamespace(
+        sheet_properties=SimpleNamespace(pageSetUpPr=SimpleNamespace(fitToPage=fit)),
+        page_setup=SimpleNamespace(fitToWidth=wide, fitToHeight=tall, scale=scale),
+    )
+
+
+@pytest.mark.parametrize("ws, expected", [
+    (_ws(fit=True), 0.25),                      # 1×1 (None = 1): limita pela altura
+    (_ws(fit=True, tall=0), 0.5),               # 1 de largura × automático
+    (_ws(fit=True, wide=2, tall=0), 1.0),       # nunca amplia
+    (_ws(fit=True, wide=0, tall=2), 0.5),
+    (_ws(scale=75), 0.75),                      # zoom da planilha
+    (_ws(scale=100), 1.0),
+    (_ws(scale=5), 0.1),                        # limite mínimo do Excel
+    (_ws(), 0.5),                               # sem configuração: 1 página de largura
+])
+def test_fit_scale(ws, expected):
+    assert _fit_scale(ws, 1000.0, 4000.0, 500.0, 1000.0) == pytest.approx(expected)
+
+
+def test_paginate():
+    sizes = {1: 40.0, 2: 40.0, 3: 40.0, 4: 100.0, 5: 10.0}
+    assert _paginate([1, 2, 3, 4, 5], sizes, 80.0) == [[1, 2], [3], [4], [5]]
+    assert _paginate([1, 2], sizes, 80.0) == [[1, 2]]
+
+
+def test_paginate_reserves_title_space():
+    sizes = {r: 10.0 for r in range(1, 11)}
+    # Título = linha 1 (10 pt): a 1ª página já o contém; as seguintes reservam 10 pt
+    assert _paginate(list(range(1, 11)), sizes, 40.0, (1, 10.0)) == [[1, 2, 3, 4], [5, 6, 7], [8, 9, 10]]
+
+
+@pytest.mark.parametrize("ref, cols, expected", [
+    ("$2:$25", False, (2, 25)),
+    ("1:3", False, (1, 3)),
+    ("$A:$B", True, (1, 2)),
+    ("$A:$B", False, None),
+    (None, False, None),
+])
+def test_title_span(ref, cols, expected):
+    assert _title_span(ref, cols) == expected
+
+
+def test_column_widths():
+    # Largura gravada já inclui a margem; só o padrão em caracteres (8,43) soma os 5 px
+    assert _col_width_pt(10) == pytest.approx(52.5)
+    assert _ui_col_width_pt(8.43) == pytest.approx(48.0, abs=0.1)
+    assert _col_width_pt(20) == pytest.approx(2 * _col_width_pt(10))
+
+
+# ---------- renderização ----------
+def _pages_text(pdf):
+    PyPDF2 = pytest.importorskip("PyPDF2")
+    return [page.extract_text() or "" for page in PyPDF2.PdfReader(str(pdf)).pages]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    pytest.importorskip("openpyxl")
+    pytest.importorskip("reportlab")
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "PLANILHA"
+    ws.page_setup.paperSize = 9
+    ws.column_dimensions["A"].width = 30
+    ws.column_dimensions["B"].width = 20
+    for r in range(1, 121):
+        ws.cell(row=r, column=1, value=f"linha {r}")
+        ws.cell(row=r, column=2, value=r * 10.5).number_format = MOEDA
+    ws["A1"] = "TITULO MESCLADO"
+    ws.merge_cells("A1:B2")
+    ws["C40"] = "MESCLA LONGA"            # atravessa a quebra de página
+    ws.merge_cells("C40:C70")
+    return wb, ws
+
+
+def test_render_paginates_and_formats(workbook, tmp_path):
+    wb, ws = workbook
+    xlsx, out = tmp_path / "p.xlsx", tmp_path / "p.pdf"
+    wb.save(xlsx)
+    render_range_to_pdf(xlsx, "PLANILHA", "A1:C120", out)   # sem ajuste: 1 de largura (cabe a 100%)
+    pages = _pages_text(out)
+    assert len(pages) > 1
+    text = "\n".join(pages)
+    assert "R$ 1.260,00" in text and "linha 120" in text
+    assert text.count("TITULO MESCLADO") == 1
+    # Mescla cortada na quebra: o texto sai só na página da âncora
+    assert sum("MESCLA LONGA" in p for p in pages) == 1
+
+
+def test_render_fit_to_one_page(workbook, tmp_path):
+    wb, ws = workbook
+    ws.sheet_properties.pageSetUpPr.fitToPage = True
+    ws.page_setup.fitToWidth = 1
+    ws.page_setup.fitToHeight = 1
+    xlsx, out = tmp_path / "p.xlsx", tmp_path / "p.pdf"
+    wb.save(xlsx)
+    render_range_to_pdf(xlsx, "PLANILHA", "A1:C120", out)
+    assert len(_pages_text(out)) == 1
+
+
+def test_render_column_bands(workbook, tmp_path):
+    wb, ws = workbook
+    for c in range(4, 30):
+        ws.cell(row=1, column=c, value=f"col{c}")
+        ws.column_dimensions[ws.cell(row=1, column=c).column_letter].width = 15
+    ws.page_setup.scale = 100
+    ws.merge_cells(start_row=5, start_column=3, end_row=5, end_column=20)  # atravessa a faixa
+    ws.cell(row=5, column=3, value="MESCLA LARGA")
+    xlsx, out = tmp_path / "p.xlsx", tmp_path / "p.pdf"
+    wb.save(xlsx)
+    render_range_to_pdf(xlsx, "PLANILHA", "A1:AC10", out, landscape=True)
+    pages = _pages_text(out)
+    assert len(pages) > 1                                   # mais de uma faixa de colunas
+    assert "col29" in pages[-1] and "col29" not in pages[0]
+    assert sum("MESCLA LARGA" in p for p in pages) == 1
+
+
+def test_render_repeats_print_titles_and_centers(workbook, tmp_path):
+    wb, ws = workbook
+    ws.print_title_rows = "1:2"
+    ws.print_options.horizontalCentered = True
+    xlsx, out = tmp_path / "p.xlsx", tmp_path / "p.pdf"
+    wb.save(xlsx)
+    render_range_to_pdf(xlsx, "PLANILHA", "A1:B120", out)
+    pages = _pages_text(out)
+    assert len(pages) > 1
+    assert all("TITULO MESCLADO" in p for p in pages)       # títulos em todas as páginas
+    assert sum(p.count("linha 120") for p in pages) == 1
+
+    pikepdf = pytest.importorskip("pikepdf")
+    with pikepdf.open(out) as pdf:
+        content = pdf.pages[0].Contents.read_bytes().decode("latin-1")
+    # Translação do bloco (a 1ª é a identidade do reportlab): centralizado, não na margem (0,7")
+    x, _ = re.findall(r"1 0 0 1 ([\d.]+) ([\d.]+) cm", content)[1]
+    assert float(x) > 0.7 * 72 + 1
@@ -0,0 +1,135 @@
+# =========================
+# file: tests/test_job.py
+# Jobs simultâneos: workspaces separados, publicação atômica sem sobrescrita e limpeza
+# =========================
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import job as job_mod
+import post_process
+from config import EXCEL_RANGES
+from job import JobContext
+
+
+def _no_link(src, dst):
+    raise OSError("hard link não suportado")
+
+
+class StubSupervisor:
+    """Faz o papel do ConversionSupervisor: "converte" gravando um PDF com o id do job."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def run(self, stage, src, func, *args, run_id=None, **kwargs):
+        from reportlab.pdfgen import canvas
+        out = Path(args[1] if stage == "docx" else args[3])  # saída: mesma posição das funções reais
+        with self._lock:
+            self.calls.append((run_id, stage, out))
+        cv = canvas.Canvas(str(out))
+        cv.drawString(72, 720, f"{stage} {run_id}")
+        cv.showPage()
+        cv.save()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    excel, docx = tmp_path / "planilha.xlsx", tmp_path / "contrato.docx"
+    excel.write_bytes(b"xlsx")
+    docx.write_bytes(b"docx")
+    return excel, docx
+
+
+def _pdf_text(pdf):
+    PyPDF2 = pytest.importorskip("PyPDF2")
+    return "\n".join(page.extract_text() or "" for page in PyPDF2.PdfReader(str(pdf)).pages)
+
+
+def test_concurrent_jobs(inputs, tmp_path):
+    pytest.importorskip("reportlab")
+    excel, docx = inputs
+    out_dir = tmp_path / "saida"
+    out_dir.mkdir()
+    # Um resultado anterior com o mesmo nome não pode ser sobrescrito
+    (out_dir / "ContratoFinal_mesmo-segundo.pdf").write_bytes(b"antigo")
+
+    sup = StubSupervisor()
+    n_jobs = 4
+    barrier = threading.Barrier(n_jobs)
+    seen = {}
+
+    def one_job():
+        with JobContext(excel_path=excel, output_dir=out_dir, supervisor=sup) as job:
+            job.stamp = "mesmo-segundo"  # por quê: força colisão de nomes entre os jobs
+            seen[job.id] = job.workspace
+            assert job.workspace.is_dir()
+            barrier.wait()
+            return job.id, post_process.build_final_pdf(docx, job=job)
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        results = [f.result() for f in [pool.submit(one_job) for _ in range(n_jobs)]]
+
+    workspaces = set(seen.values())
+    assert len(workspaces) == n_jobs
+    outputs = [out for _, out in results]
+    assert len(set(outputs)) == n_jobs and all(p.parent == out_dir for p in outputs)
+    for job_id, out in results:
+        text = _pdf_text(out)
+        assert f"docx {job_id}" in text
+        assert not any(other in text for other in seen if other != job_id)
+        assert sum(rid == job_id for rid, _, _ in sup.calls) == 1 + len(EXCEL_RANGES)
+    assert (out_dir / "ContratoFinal_mesmo-segundo.pdf").read_bytes() == b"antigo"
+    # Conversões de cada job só escrevem no próprio workspace
+    for run_id, _, out in sup.calls:
+        assert out.is_relative_to(seen[run_id])
+    # Workspaces removidos ao sair
+    assert not any(p.exists() for p in workspaces)
+    assert not list(out_dir.glob("_job_*"))
+
+
+def test_publish_never_overwrites(tmp_path):
+    with JobContext(output_dir=tmp_path, supervisor=StubSupervisor()) as job:
+        names = []
+        for i in range(3):
+            src = job.workspace / f"f{i}.pdf"
+            src.write_text(str(i))
+            names.append(job.publish(src, "final.pdf").name)
+        assert names == ["final.pdf", "final_2.pdf", "final_3.pdf"]
+        assert [(tmp_path / n).read_text() for n in names] == ["0", "1", "2"]
+
+
+def test_publish_without_hardlinks_reserves_name(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_mod.os, "link", _no_link)
+
+    jobs = [JobContext(output_dir=tmp_path, supervisor=StubSupervisor()) for _ in range(8)]
+    for j in jobs:
+        j.__enter__()
+        (j.workspace / "final.pdf").write_text(j.id)
+    barrier = threading.Barrier(len(jobs))
+
+    def publish(j):
+        barrier.wait()
+        return j.publish(j.workspace / "final.pdf", "final.pdf")
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            targets = list(pool.map(publish, jobs))
+    finally:
+        for j in jobs:
+            j.cleanup()
+    assert len(set(targets)) == len(jobs)
+    assert sorted(t.read_text() for t in targets) == sorted(j.id for j in jobs)
+
+
+def test_publish_failure_leaves_no_reservation(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_mod.os, "link", _no_link)
+    with JobContext(output_dir=tmp_path, supervisor=StubSupervisor()) as job:
+        with pytest.raises(FileNotFoundError):
+            job.publish(job.workspace / "inexistente.pdf", "final.pdf")
+    assert not (tmp_path / "final.pdf").exists()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,104 @@
+# =========================
+# file: tests/test_linearize.py
+# PDF final linearizado (fast web view) e sua verificação
+# =========================
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pikepdf")
+pytest.importorskip("PyPDF2")
+pytest.importorskip("reportlab")
+
+import post_process  # noqa: E402
+
+
+def _make_pdf(path: Path, pages: int) -> Path:
+    from reportlab.pdfgen import canvas
+    cv = canvas.Canvas(str(path))
+    for i in range(pages):
+        cv.drawString(72, 720, f"{path.stem} — página {i + 1}")
+        cv.showPage()
+    cv.save()
+    return path
+
+
+def test_verify_rejects_plain_pdf(tmp_path):
+    plain = _make_pdf(tmp_path / "plain.pdf", 3)
+    assert post_process._verify_linearized(plain) is False
+
+
+def test_verify_rejects_broken_file(tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    assert post_process._verify_linearized(broken) is False
+
+
+def test_linearize_pdf_is_verified(tmp_path):
+    plain = _make_pdf(tmp_path / "plain.pdf", 3)
+    out = tmp_path / "lin.pdf"
+    post_process._linearize_pdf(plain, out)
+    assert post_process._verify_linearized(out) is True
+
+
+def test_verify_keeps_sys_stderr(tmp_path):
+    import sys
+    plain = _make_pdf(tmp_path / "plain.pdf", 1)
+    out = tmp_path / "lin.pdf"
+    post_process._linearize_pdf(plain, out)
+    before = sys.stderr
+    post_process._verify_linearized(out)
+    assert sys.stderr is before
+
+
+def test_concurrent_verify_keeps_sys_stderr(tmp_path):
+    # por quê: jobs paralelos verificam ao mesmo tempo; sem lock um thread restaurava o
+    # StringIO de outro e o sys.stderr do processo ficava apontando para um relatório
+    import sys
+    import threading
+    plain = _make_pdf(tmp_path / "plain.pdf", 1)
+    out = tmp_path / "lin.pdf"
+    post_process._linearize_pdf(plain, out)
+    before = sys.stderr
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    leaked = 0
+    try:
+        for _ in range(100):
+            barrier = threading.Barrier(8)
+
+            def verify():
+                barrier.wait()
+                for _ in range(5):
+                    post_process._verify_linearized(out)
+
+            threads = [threading.Thread(target=verify) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if sys.stderr is not before:
+                leaked += 1
+                sys.stderr = before
+    finally:
+        sys.setswitchinterval(interval)
+    assert leaked == 0
+
+
+def test_merge_linearized_keeps_pages_and_cleans_temp(tmp_path):
+    parts = [_make_pdf(tmp_path / f"p{i}.pdf", 2) for i in range(3)]
+    out = tmp_path / "saida" / "final.pdf"
+    post_process._merge_pdfs(parts, out, linearize=True)
+
+    import pikepdf
+    with pikepdf.open(out) as pdf:
+        assert pdf.is_linearized
+        assert len(pdf.pages) == 6
+    assert sorted(p.name for p in out.parent.iterdir()) == ["final.pdf"]
+
+
+def test_merge_plain_by_default(tmp_path):
+    parts = [_make_pdf(tmp_path / f"p{i}.pdf", 1) for i in range(2)]
+    out = tmp_path / "final.pdf"
+    post_process._merge_pdfs(parts, out)
+    assert post_process._verify_linearized(out) is False
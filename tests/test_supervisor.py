@@ -0,0 +1,231 @@
+# =========================
+# file: tests/test_supervisor.py
+# Supervisor das conversões com backends falsos: prazo/kill, retry com backoff e quarentena
+# =========================
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import fake_backends
+import supervisor
+from supervisor import ConversionFailed, ConversionSupervisor, QuarantinedInput
+
+
+def _alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as fp:
+            return fp.read().split(")")[-1].split()[0] not in ("Z", "X")
+    except FileNotFoundError:
+        return False
+
+
+def _wait_dead(pid: int, seconds: float = 5.0) -> bool:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if not _alive(pid):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+needs_proc = pytest.mark.skipif(not os.path.isdir("/proc"), reason="usa /proc para checar processos")
+
+
+@pytest.fixture
+def src(tmp_path):
+    p = tmp_path / "entrada.docx"
+    p.write_text("docx")
+    return p
+
+
+@pytest.fixture
+def make_sup(tmp_path):
+    def _make(**kw):
+        opts = dict(timeouts={"fake": 2.0}, retries=0, backoff=0.0, quarantine_after=2,
+                    quarantine_dir=tmp_path / "quarentena")
+        opts.update(kw)
+        return ConversionSupervisor(**opts)
+    return _make
+
+
+def test_ok(make_sup, src, tmp_path):
+    out = tmp_path / "out.pdf"
+    make_sup().run("fake", src, fake_backends.ok, out)
+    assert out.read_text() == "ok"
+
+
+@needs_proc
+def test_timeout_kills_worker(make_sup, src, tmp_path):
+    pid_file = tmp_path / "worker.pid"
+    t0 = time.monotonic()
+    with pytest.raises(ConversionFailed, match="sem resposta"):
+        make_sup(timeouts={"fake": 1.0}).run("fake", src, fake_backends.hang, pid_file)
+    assert time.monotonic() - t0 < 10
+    assert _wait_dead(int(pid_file.read_text()))
+
+
+@needs_proc
+def test_timeout_kills_registered_office(make_sup, src, tmp_path):
+    pid_file = tmp_path / "office.pid"
+    with pytest.raises(ConversionFailed, match="sem resposta"):
+        make_sup(timeouts={"fake": 3.0}).run("fake", src, fake_backends.office_hang, pid_file)
+    assert _wait_dead(int(pid_file.read_text()))
+
+
+@needs_proc
+def test_crashed_worker_office_is_reaped(make_sup, src, tmp_path):
+    pid_file = tmp_path / "office.pid"
+    with pytest.raises(ConversionFailed, match="código 1"):
+        make_sup().run("fake", src, fake_backends.office_crash, pid_file)
+    assert _wait_dead(int(pid_file.read_text()))
+
+
+def test_released_office_is_not_killed(make_sup, src, tmp_path, monkeypatch):
+    killed = []
+    monkeypatch.setattr(supervisor, "_kill_pid", killed.append)
+    make_sup().run("fake", src, fake_backends.office_clean, tmp_path / "office.pid")
+    assert killed == []
+
+
+def test_error_message_is_propagated(make_sup, src, tmp_path):
+    with pytest.raises(ConversionFailed, match="OSError: arquivo bloqueado"):
+        make_sup().run("fake", src, fake_backends.boom, tmp_path / "o.pdf")
+
+
+def test_crash_without_outcome(make_sup, src, tmp_path):
+    with pytest.raises(ConversionFailed, match="código 3"):
+        make_sup().run("fake", src, fake_backends.crash, tmp_path / "o.pdf")
+
+
+def test_retry_with_exponential_backoff(make_sup, src, tmp_path, monkeypatch):
+    delays = []
+    monkeypatch.setattr(supervisor.time, "sleep", delays.append)
+    counter, out = tmp_path / "calls", tmp_path / "out.pdf"
+    make_sup(retries=3, backoff=0.5).run("fake", src, fake_backends.flaky, counter, 2, out)
+    assert counter.read_text() == "3"
+    assert out.exists()
+    assert delays == [0.5, 1.0]
+
+
+def test_quarantine_after_n_failed_runs(make_sup, src, tmp_path):
+    sup = make_sup(retries=1, quarantine_after=2)
+    for _ in range(2):
+        with pytest.raises(ConversionFailed):
+            sup.run("fake", src, fake_backends.boom, tmp_path / "o.pdf")
+    assert sup.is_quarantined("fake", src)
+    copies = [p for p in (tmp_path / "quarentena").iterdir() if p.name != "estado.json"]
+    assert len(copies) == 1 and copies[0].name.endswith("_fake_entrada.docx")
+
+    with pytest.raises(QuarantinedInput):
+        sup.run("fake", src, fake_backends.ok, tmp_path / "o.pdf")
+
+
+def test_success_resets_failure_count(make_sup, src, tmp_path):
+    sup = make_sup(quarantine_after=2)
+    with pytest.raises(ConversionFailed):
+        sup.run("fake", src, fake_backends.boom, tmp_path / "o.pdf")
+    sup.run("fake", src, fake_backends.ok, tmp_path / "o.pdf")
+    with pytest.raises(ConversionFailed):
+        sup.run("fake", src, fake_backends.boom, tmp_path / "o.pdf")
+    assert not sup.is_quarantined("fake", src)
+
+
+def test_changed_input_leaves_quarantine(make_sup, src, tmp_path):
+    sup = make_sup(quarantine_after=1)
+    with pytest.raises(ConversionFailed):
+        sup.run("fake", src, fake_backends.boom, tmp_path / "o.pdf")
+    assert sup.is_quarantined("fake", src)
+    src.write_text("docx corrigido")
+    sup.run("fake", src, fake_backends.ok, tmp_path / "o.pdf")
+
+
+def test_same_run_counts_once(make_sup, src, tmp_path):
+    # por quê: várias áreas nativas da mesma planilha falhando no mesmo job = 1 execução
+    sup = make_sup(quarantine_after=2)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(sup.run, "fake", src, fake_backends.boom, tmp_path / "o.pdf", run_id="job-1")
+                   for _ in range(2)]
+    for f in futures:
+        with pytest.raises(ConversionFailed):
+            f.result()
+    assert not sup.is_quarantined("fake", src)
+    with pytest.raises(ConversionFailed):
+        sup.run("fake", src, fake_backends.boom, tmp_path / "o.pdf", run_id="job-2")
+    assert sup.is_quarantined("fake", src)
+
+
+def test_quarantine_is_per_stage(make_sup, src, tmp_path):
+    sup = make_sup(timeouts={"fake": 2.0, "native": 2.0}, quarantine_after=1)
+    with pytest.raises(ConversionFailed):
+        sup.run("native", src, fake_backends.boom, tmp_path / "o.pdf")
+    assert sup.is_quarantined("native", src)
+    out = tmp_path / "out.pdf"
+    sup.run("fake", src, fake_backends.ok, out)  # mesma planilha, outra etapa
+    assert out.read_text() == "ok"
+
+
+def test_native_stage_never_reaps(make_sup, src, tmp_path, monkeypatch):
+    killed = []
+    monkeypatch.setattr(supervisor, "_kill_pid", killed.append)
+    pid_file = tmp_path / "office.pid"
+    with pytest.raises(ConversionFailed, match="código 1"):
+        make_sup(timeouts={"native": 2.0}).run("native", src, fake_backends.office_crash, pid_file)
+    os.kill(int(pid_file.read_text()), 9)
+    assert killed == []
+
+
+def test_quarantine_survives_restart(make_sup, src, tmp_path):
+    # por quê: main.py roda um job por processo; a contagem precisa ir para o disco
+    with pytest.raises(ConversionFailed):
+        make_sup().run("fake", src, fake_backends.boom, tmp_path / "o.pdf", run_id="job-1")
+    with pytest.raises(ConversionFailed):
+        make_sup().run("fake", src, fake_backends.boom, tmp_path / "o.pdf", run_id="job-2")
+    restarted = make_sup()
+    assert restarted.is_quarantined("fake", src)
+    with pytest.raises(QuarantinedInput):
+        restarted.run("fake", src, fake_backends.ok, tmp_path / "o.pdf")
+
+
+def test_state_file_shared_between_instances(make_sup, src, tmp_path):
+    a, b = make_sup(quarantine_after=1), make_sup(quarantine_after=1)
+    with pytest.raises(ConversionFailed):
+        a.run("fake", src, fake_backends.boom, tmp_path / "o.pdf")
+    with pytest.raises(QuarantinedInput):
+        b.run("fake", src, fake_backends.ok, tmp_path / "o.pdf")  # checado no run, sem reiniciar
+
+
+def test_docx_keyed_on_repeated_inputs(make_sup, tmp_path):
+    # O DOCX preenchido muda de caminho a cada job; planilha + template se repetem
+    workbook, template = tmp_path / "planilha.xlsx", tmp_path / "template.docx"
+    workbook.write_text("xlsx")
+    template.write_text("template")
+    sup = make_sup(quarantine_after=2)
+    for job in ("job-1", "job-2"):
+        filled = tmp_path / f"_job_{job}" / "ContratoPreenchido.docx"
+        filled.parent.mkdir()
+        filled.write_text(job)
+        with pytest.raises(ConversionFailed):
+            sup.run("fake", filled, fake_backends.boom, tmp_path / "o.pdf",
+                    run_id=job, inputs=(workbook, template))
+    assert sup.is_quarantined("fake", filled, inputs=(workbook, template))
+
+
+def test_worker_logs_reach_parent(make_sup, src, tmp_path, caplog):
+    out = tmp_path / "out.pdf"
+    with caplog.at_level(logging.INFO):
+        make_sup().run("fake", src, fake_backends.chatty, 500, out)  # ~100 KB: mais que o pipe
+    assert out.read_text() == "ok"
+    lines = [r for r in caplog.records if r.name == "post_process"]
+    assert len(lines) == 500
+    assert lines[-1].getMessage().startswith("Excel→PDF linha 00499")
+
+
+def test_office_pid_unknown_is_logged(caplog):
+    class App:
+        Name = "Microsoft Word"
+    with caplog.at_level(logging.WARNING, logger="supervisor"):
+        assert supervisor.office_pid(App()) is None
+    assert "PID do Microsoft Word não identificado" in caplog.text